@@ -1,19 +1,43 @@
+import atexit
 import base64
 import json
+import locale
 import os
+import queue
 import sys
 import re
+import signal
+import string
 import time
 import subprocess
 import threading
 import logging
 import uuid
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from collections import OrderedDict
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from multiprocessing.connection import Client
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Tuple
+from typing import IO, Callable, Dict, Any, List, Optional, Tuple
 
 import mysql.connector
-from dotenv import load_dotenv
+from mysql.connector.pooling import MySQLConnectionPool
+from dotenv import dotenv_values, load_dotenv
 from google.cloud import pubsub_v1
+from google.cloud.pubsub_v1.subscriber.scheduler import ThreadScheduler
+
+try:
+    import orjson
+
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:  # orjson is optional; the stdlib produces the same JSON, only slower
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    _json_loads = json.loads
 
 ERROR_EXIT_CODE_TO_GENRE = {
     41: "proxy_block",
@@ -22,9 +46,98 @@ ERROR_EXIT_CODE_TO_GENRE = {
     44: "unknown",
 }
 PROXY_BLOCK_RETRY_DELAY_SEC = 300
+QUEUE_META_SUFFIX = ".meta.json"
+QUEUE_DATA_SUFFIX = ".bin"
+QUEUE_EVENTS_SUFFIX = ".att"
+SUBPROCESS_PIPE_BUFSIZE = 1024 * 1024
+CRAWLER_ENV_PRELOADED_KEY = "CRAWLER_ENV_PRELOADED"
+PERSISTENT_WORKER_MAX_JOBS = 20
+PERSISTENT_WORKER_HANDSHAKE = b"AGENT_POOL_ADDRESS "
+RECENT_JOB_MAXSIZE = 1024
+RECENT_JOB_TTL_SEC = 600
+REDELIVERY_BACKOFF_BASE_SEC = 10
+REDELIVERY_BACKOFF_MAX_SEC = 600  # Pub/Sub's ack deadline ceiling
+DUPLICATE_DEFER_SEC = 60  # well under RECENT_JOB_TTL_SEC so the completed key is still remembered
+FLOW_CONTROL_MAX_BYTES = 10 * 1024 * 1024
+STREAM_MAX_LEASE_SEC = 24 * 3600
+SHUTDOWN_TIMEOUT_SEC = 30
+LOG_FILE_MAX_BYTES = 50 * 1024 * 1024
+LOG_FILE_BACKUP_COUNT = 5
+ERROR_LOG_POOL_SIZE = 4
+ERROR_LOG_BATCH_SIZE = 32
+ERROR_LOG_FLUSH_INTERVAL_SEC = 2.0
+ERROR_LOG_INSERT_SQL = """
+    INSERT INTO crawler_error_logs (subscription_name, error_genre, created_at)
+    VALUES (%s, %s, %s)
+"""
+
+# (pool, subscription, error_genre, created_at, logger); None stops the flusher
+error_log_queue: "queue.Queue[Optional[Tuple[_ErrorLogPool, str, str, datetime, logging.Logger]]]" = queue.Queue()
+_error_log_flusher: Optional[threading.Thread] = None
+_error_log_flusher_lock = threading.Lock()
+
+class _RecentKeys:
+    """Bounded set whose entries expire after ttl seconds. Not thread-safe."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._items: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+
+    def __contains__(self, key: Tuple[str, str]) -> bool:
+        expires_at = self._items.get(key)
+        if expires_at is None:
+            return False
+        if expires_at < time.monotonic():
+            del self._items[key]
+            return False
+        return True
+
+    def add(self, key: Tuple[str, str]) -> None:
+        self._items.pop(key, None)
+        self._items[key] = time.monotonic() + self.ttl
+        while len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+
+class _ActiveTasks:
+    """Counts tasks running on a worker's executor so shutdown can wait for them with a deadline."""
+
+    def __init__(self):
+        self._count = 0
+        self._cond = threading.Condition()
+
+    def __enter__(self) -> "_ActiveTasks":
+        with self._cond:
+            self._count += 1
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        with self._cond:
+            self._count -= 1
+            if not self._count:
+                self._cond.notify_all()
+
+    def wait_idle(self, timeout: float) -> bool:
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._count, timeout)
+
+def _dedupe_key(msg_id: str, attributes: Dict[str, str]) -> Tuple[str, str]:
+    # retries carry origin_message_id; retry_count keeps a genuine retry from matching its own original
+    return (attributes.get("origin_message_id") or msg_id, attributes.get("retry_count") or "0")
+
+_ENSURED_DIRS = set()
+_ENSURED_DIRS_LOCK = threading.Lock()
 
 def ensure_dir(p: str) -> None:
-    Path(p).mkdir(parents=True, exist_ok=True)
+    if p in _ENSURED_DIRS:
+        return
+    with _ENSURED_DIRS_LOCK:
+        if p not in _ENSURED_DIRS:
+            Path(p).mkdir(parents=True, exist_ok=True)
+            _ENSURED_DIRS.add(p)
+
+_LOG_LISTENERS: Dict[str, QueueListener] = {}
+_LOG_LISTENERS_LOCK = threading.Lock()
 
 def setup_logger(subscription: str, log_dir: str) -> logging.Logger:
     ensure_dir(log_dir)
@@ -37,16 +150,36 @@ def setup_logger(subscription: str, log_dir: str) -> logging.Logger:
     log_path = os.path.join(log_dir, f"agent_multi-{subscription}.log")
     formatter = logging.Formatter("%(asctime)s [%(levelname)s] %(message)s")
 
-    file_handler = logging.FileHandler(log_path, encoding="utf-8")
+    file_handler = RotatingFileHandler(
+        log_path,
+        maxBytes=LOG_FILE_MAX_BYTES,
+        backupCount=LOG_FILE_BACKUP_COUNT,
+        encoding="utf-8",
+    )
     file_handler.setFormatter(formatter)
     stream_handler = logging.StreamHandler(sys.stdout)
     stream_handler.setFormatter(formatter)
 
-    logger.addHandler(file_handler)
-    logger.addHandler(stream_handler)
+    # callbacks only enqueue records; file and console I/O happen on the listener thread
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+    listener = QueueListener(log_queue, file_handler, stream_handler, respect_handler_level=True)
+    listener.start()
+    with _LOG_LISTENERS_LOCK:
+        if not _LOG_LISTENERS:
+            atexit.register(_stop_log_listeners)
+        _LOG_LISTENERS[log_path] = listener
+
+    logger.addHandler(QueueHandler(log_queue))
     logger.info("Logger initialized. log_path=%s", log_path)
     return logger
 
+def _stop_log_listeners() -> None:
+    with _LOG_LISTENERS_LOCK:
+        listeners = list(_LOG_LISTENERS.values())
+        _LOG_LISTENERS.clear()
+    for listener in listeners:
+        listener.stop()
+
 _MODULE_NAME_RE = re.compile(r"^[a-zA-Z0-9_.]+$")
 
 def _select_module_name(body: Dict[str, Any], logger: logging.Logger) -> str:
@@ -57,16 +190,227 @@ def _select_module_name(body: Dict[str, Any], logger: logging.Logger) -> str:
         logger.warning("Invalid module override. module=%s", raw)
     return "src.crawler.tiktok_crawler"
 
+@lru_cache(maxsize=256)
+def _format_command(parts: Tuple[str, ...]) -> str:
+    return " ".join([f'\"{c}\"' if " " in c else c for c in parts])
+
+@lru_cache(maxsize=1024)
+def _cached_command(
+    python_path: str,
+    module_name: str,
+    args: Tuple[str, ...],
+    extra_args: Tuple[str, ...],
+) -> Tuple[Tuple[str, ...], str]:
+    # the same crawl jobs recur, so reuse both the argv and its log form
+    cmd = (python_path, "-m", module_name) + args + extra_args
+    display = f"{_format_command((python_path, '-m', module_name))} {_format_command(args + extra_args)}".rstrip()
+    return cmd, display
+
+class InvalidJobError(ValueError):
+    """The message body cannot be turned into a crawler command; retrying will not help."""
+
+def _job_args(body: Any) -> Tuple[str, ...]:
+    if not isinstance(body, dict):
+        raise InvalidJobError(f"body must be a JSON object: {type(body).__name__}")
+    raw = body.get("args", [])
+    # a bare string would otherwise be splatted into one argv entry per character
+    if not isinstance(raw, list):
+        raise InvalidJobError(f"args must be a list: {raw!r}")
+    for arg in raw:
+        if isinstance(arg, bool) or not isinstance(arg, (str, int, float)):
+            raise InvalidJobError(f"args must contain only strings or numbers: {arg!r}")
+    return tuple(str(a) for a in raw)
+
 def build_command(
     python_path: str,
     body: Dict[str, Any],
-    extra_args: List[str],
+    extra_args: Tuple[str, ...],
     logger: logging.Logger,
-) -> List[str]:
+) -> Tuple[List[str], str]:
+    args = _job_args(body)
     module_name = _select_module_name(body, logger)
-    base = [python_path, "-m", module_name]
-    args = body.get("args", [])
-    return base + list(args) + list(extra_args or [])
+    cmd, display = _cached_command(python_path, module_name, args, extra_args)
+    return list(cmd), display
+
+def _pump_stream(stream: IO[bytes], logger: logging.Logger, level: int, label: str, encoding: str) -> None:
+    try:
+        if not logger.isEnabledFor(level):
+            # still drain the pipe so the child never blocks on a full buffer
+            for _ in stream:
+                pass
+            return
+        for raw in stream:
+            logger.log(level, "%s: %s", label, raw.rstrip().decode(encoding, errors="replace"))
+    finally:
+        stream.close()
+
+def _crawler_env(working_dir: str) -> Dict[str, str]:
+    # hand the crawler its .env up front so src/config.py can skip load_dotenv
+    env_path = Path(working_dir) / ".env"
+    if not env_path.exists():
+        return dict(os.environ)
+    env = {key: value for key, value in dotenv_values(env_path).items() if value is not None}
+    env.update(os.environ)  # same precedence as load_dotenv(override=False)
+    env[CRAWLER_ENV_PRELOADED_KEY] = "1"
+    return env
+
+def _run_subprocess(cmd: List[str], working_dir: str, env: Dict[str, str], logger: logging.Logger) -> int:
+    # decode with the locale encoding as text=True did, one line at a time
+    encoding = locale.getpreferredencoding(False)
+    proc = subprocess.Popen(
+        cmd,
+        cwd=working_dir,
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        bufsize=SUBPROCESS_PIPE_BUFSIZE,
+    )
+    pumps = [
+        threading.Thread(target=_pump_stream, args=(proc.stdout, logger, logging.INFO, "stdout", encoding), daemon=True),
+        threading.Thread(target=_pump_stream, args=(proc.stderr, logger, logging.WARNING, "stderr", encoding), daemon=True),
+    ]
+    for pump in pumps:
+        pump.start()
+    returncode = proc.wait()
+    for pump in pumps:
+        pump.join()
+    return returncode
+
+# Runs inside python_path (the crawler's own venv), so it may only use the stdlib.
+_PERSISTENT_WORKER_SOURCE = r'''
+import logging, os, runpy, sys, traceback
+from multiprocessing.connection import Listener
+
+with Listener(authkey=bytes.fromhex(os.environ.pop("AGENT_POOL_AUTHKEY"))) as listener:
+    sys.stdout.write("AGENT_POOL_ADDRESS %s\n" % listener.address)
+    sys.stdout.flush()
+    conn = listener.accept()
+while True:
+    try:
+        job = conn.recv()
+    except EOFError:
+        break
+    if job is None:
+        break
+    module_name, args = job
+    sys.argv = [module_name] + list(args)
+    code = 0
+    try:
+        runpy.run_module(module_name, run_name="__main__", alter_sys=True)
+    except SystemExit as e:
+        code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    except BaseException:
+        traceback.print_exc()
+        code = 1
+    main_logger = logging.getLogger("__main__")
+    for handler in list(main_logger.handlers):
+        main_logger.removeHandler(handler)
+        handler.close()
+    sys.stdout.flush()
+    sys.stderr.flush()
+    conn.send(code)
+'''
+
+class _PersistentCrawler:
+    def __init__(self, python_path: str, working_dir: str, env: Dict[str, str], logger: logging.Logger):
+        authkey = os.urandom(32)
+        env = dict(env, AGENT_POOL_AUTHKEY=authkey.hex())
+        self.proc = subprocess.Popen(
+            [python_path, "-c", _PERSISTENT_WORKER_SOURCE],
+            cwd=working_dir,
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            bufsize=SUBPROCESS_PIPE_BUFSIZE,
+        )
+        line = self.proc.stdout.readline()
+        if not line.startswith(PERSISTENT_WORKER_HANDSHAKE):
+            self.proc.kill()
+            self.proc.wait()
+            raise RuntimeError(f"Persistent worker failed to start. returncode={self.proc.returncode}")
+        address = line[len(PERSISTENT_WORKER_HANDSHAKE):].strip().decode("utf-8")
+        self.conn = Client(address, authkey=authkey)
+        encoding = locale.getpreferredencoding(False)
+        for stream, level, label in (
+            (self.proc.stdout, logging.INFO, "stdout"),
+            (self.proc.stderr, logging.WARNING, "stderr"),
+        ):
+            threading.Thread(target=_pump_stream, args=(stream, logger, level, label, encoding), daemon=True).start()
+        self.jobs = 0
+
+    def run(self, module_name: str, args: List[str]) -> Optional[int]:
+        # None means the process died mid-job; the caller falls back to its exit code
+        self.jobs += 1
+        try:
+            self.conn.send((module_name, args))
+            return self.conn.recv()
+        except (EOFError, OSError):
+            return None
+
+    def close(self, timeout: float = 10) -> int:
+        try:
+            self.conn.send(None)
+            self.conn.close()
+        except OSError:
+            pass
+        try:
+            return self.proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+            return self.proc.wait()
+
+class CrawlerWorkerPool:
+    """Keeps crawler interpreters alive between jobs so imports (selenium, DB drivers) are paid once."""
+
+    def __init__(
+        self,
+        python_path: str,
+        working_dir: str,
+        env: Dict[str, str],
+        size: int,
+        max_jobs: int,
+        logger: logging.Logger,
+    ):
+        self.python_path = python_path
+        self.working_dir = working_dir
+        self.env = env
+        self.max_jobs = max_jobs
+        self.logger = logger
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle: List[_PersistentCrawler] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def run(self, module_name: str, args: List[str]) -> int:
+        with self._slots:
+            with self._lock:
+                crawler = self._idle.pop() if self._idle else None
+            if crawler is None:
+                crawler = _PersistentCrawler(self.python_path, self.working_dir, self.env, self.logger)
+                self.logger.info("Persistent worker started. pid=%s", crawler.proc.pid)
+            returncode = crawler.run(module_name, args)
+            if returncode is None:
+                returncode = crawler.close(timeout=0)
+                self.logger.warning("Persistent worker died. pid=%s returncode=%s", crawler.proc.pid, returncode)
+                return returncode
+            if returncode != 0 or crawler.jobs >= self.max_jobs:
+                # a failed run may leave a browser or module state behind; start clean next time
+                self.logger.info("Persistent worker recycled. pid=%s jobs=%s returncode=%s", crawler.proc.pid, crawler.jobs, returncode)
+                crawler.close()
+                return returncode
+            with self._lock:
+                if not self._closed:
+                    self._idle.append(crawler)
+                    return returncode
+            crawler.close()
+            return returncode
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for crawler in idle:
+            crawler.close()
 
 def _queue_dir_path(queue_dir: Optional[str], subscription: str, working_dir: str) -> str:
     base = queue_dir or os.path.join(working_dir, "queue")
@@ -74,22 +418,62 @@ def _queue_dir_path(queue_dir: Optional[str], subscription: str, working_dir: st
     ensure_dir(path)
     return path
 
+_MESSAGE_ID_ALLOWED = frozenset(string.ascii_letters + string.digits + "-_")
+_MESSAGE_ID_DELETE = str.maketrans("", "", "".join(chr(c) for c in range(128) if chr(c) not in _MESSAGE_ID_ALLOWED))
+
 def _sanitize_message_id(message_id: str) -> str:
+    if message_id.isascii():
+        return message_id.translate(_MESSAGE_ID_DELETE)
     return "".join(c for c in message_id if c.isalnum() or c in ("-", "_"))
 
-def _write_json(path: str, payload: Dict[str, Any]) -> None:
+_O_TMPFILE = getattr(os, "O_TMPFILE", None)
+
+def _link_tmpfile(path: str, data: bytes) -> bool:
+    # Linux only: write an unnamed file and give it its name in one step
+    try:
+        fd = os.open(os.path.dirname(path) or ".", _O_TMPFILE | os.O_WRONLY, 0o666)
+    except OSError:
+        return False
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+        # any dir_fd makes os.link use linkat(AT_SYMLINK_FOLLOW); plain link() fails with EXDEV here.
+        # The source path is absolute, so the fd itself is ignored.
+        os.link(f"/proc/self/fd/{fd}", path, src_dir_fd=fd, follow_symlinks=True)
+        return True
+    except OSError:
+        return False
+    finally:
+        os.close(fd)
+
+def _write_bytes_atomic(path: str, data: bytes) -> None:
+    # linkat cannot replace an existing file, so updates keep the tmp+rename path
+    if _O_TMPFILE is not None and not os.path.exists(path) and _link_tmpfile(path, data):
+        return
     tmp = path + ".tmp"
-    with open(tmp, "w", encoding="utf-8") as fp:
-        json.dump(payload, fp, ensure_ascii=True)
+    with open(tmp, "wb") as fp:
+        fp.write(data)
     os.replace(tmp, path)
 
-def _load_db_config(working_dir: str, logger: logging.Logger) -> Optional[Dict[str, str]]:
-    env_path = Path(working_dir) / ".env"
-    if env_path.exists():
-        load_dotenv(env_path)
-    else:
-        load_dotenv()
+def _write_json(path: str, payload: Dict[str, Any]) -> None:
+    _write_bytes_atomic(path, _json_dumps(payload))
 
+def _load_env_files(working_dirs: List[str]) -> None:
+    # called once from main before any worker starts; load_dotenv never overrides, so the first file wins
+    loaded = set()
+    for working_dir in working_dirs:
+        env_path = Path(working_dir) / ".env"
+        key = str(env_path) if env_path.exists() else None
+        if key in loaded:
+            continue
+        loaded.add(key)
+        if key:
+            load_dotenv(env_path)
+        else:
+            load_dotenv()
+
+def _load_db_config(logger: logging.Logger) -> Optional[Dict[str, str]]:
     config = {
         "host": os.getenv("MYSQL_HOST", ""),
         "user": os.getenv("MYSQL_USER", ""),
@@ -102,35 +486,108 @@ def _load_db_config(working_dir: str, logger: logging.Logger) -> Optional[Dict[s
         return None
     return config
 
+class _ErrorLogPool:
+    """Connection pool created on first use; a failed init is retried on the next flush.
+
+    Only the error-log flusher thread calls get(), so this is not thread-safe.
+    """
+
+    def __init__(self, db_config: Dict[str, str], subscription: str, logger: logging.Logger):
+        self.db_config = db_config
+        self.subscription = subscription
+        self.logger = logger
+        self._pool: Optional[MySQLConnectionPool] = None
+
+    def get(self) -> Optional[MySQLConnectionPool]:
+        if self._pool is None:
+            try:
+                self._pool = MySQLConnectionPool(
+                    pool_name=f"agent-{self.subscription}",
+                    pool_size=ERROR_LOG_POOL_SIZE,
+                    **self.db_config,
+                )
+            except mysql.connector.Error:
+                self.logger.exception("Error log pool init failed. subscription=%s", self.subscription)
+        return self._pool
+
+def _flush_error_logs(batch: List[Tuple[_ErrorLogPool, str, str, datetime, logging.Logger]]) -> None:
+    by_pool: Dict[int, List[Tuple[_ErrorLogPool, str, str, datetime, logging.Logger]]] = {}
+    for item in batch:
+        by_pool.setdefault(id(item[0]), []).append(item)
+    for items in by_pool.values():
+        error_log_pool, _, _, _, logger = items[0]
+        rows = [(subscription, error_genre, created_at) for _, subscription, error_genre, created_at, _ in items]
+        pool = error_log_pool.get()
+        if pool is None:
+            logger.error("Error log pool unavailable. dropped count=%d rows=%s", len(rows), rows)
+            continue
+        conn = None
+        try:
+            conn = pool.get_connection()
+            # plain cursor so executemany is rewritten into one multi-row INSERT
+            cursor = conn.cursor()
+            cursor.executemany(ERROR_LOG_INSERT_SQL, rows)
+            conn.commit()
+            cursor.close()
+            logger.info("Error logs saved. count=%d", len(rows))
+        except mysql.connector.Error:
+            logger.exception("Error log insert failed. count=%d rows=%s", len(rows), rows)
+        finally:
+            if conn:
+                conn.close()
+
+def _error_log_flusher_loop() -> None:
+    while True:
+        item = error_log_queue.get()
+        if item is None:
+            return
+        batch = [item]
+        deadline = time.monotonic() + ERROR_LOG_FLUSH_INTERVAL_SEC
+        stopping = False
+        while len(batch) < ERROR_LOG_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = error_log_queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                stopping = True
+                break
+            batch.append(item)
+        _flush_error_logs(batch)
+        if stopping:
+            return
+
+def _stop_error_log_flusher() -> None:
+    flusher = _error_log_flusher
+    if flusher is None or not flusher.is_alive():
+        return
+    error_log_queue.put(None)
+    flusher.join(timeout=10)
+
+def _ensure_error_log_flusher() -> None:
+    global _error_log_flusher
+    with _error_log_flusher_lock:
+        if _error_log_flusher is not None:
+            return
+        _error_log_flusher = threading.Thread(target=_error_log_flusher_loop, name="error-log-flusher", daemon=True)
+        _error_log_flusher.start()
+        atexit.register(_stop_error_log_flusher)
+
 def _insert_error_log(
-    db_config: Optional[Dict[str, str]],
+    pool: Optional[_ErrorLogPool],
     subscription: str,
     error_genre: str,
     logger: logging.Logger,
 ) -> bool:
-    if not db_config:
-        return False
-    conn = None
-    try:
-        conn = mysql.connector.connect(**db_config)
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            INSERT INTO crawler_error_logs (subscription_name, error_genre, created_at)
-            VALUES (%s, %s, NOW())
-            """,
-            (subscription, error_genre),
-        )
-        conn.commit()
-        cursor.close()
-        logger.info("Error log saved. subscription=%s error_genre=%s", subscription, error_genre)
-        return True
-    except mysql.connector.Error:
-        logger.exception("Error log insert failed. subscription=%s error_genre=%s", subscription, error_genre)
+    if not pool:
         return False
-    finally:
-        if conn:
-            conn.close()
+    _ensure_error_log_flusher()
+    error_log_queue.put((pool, subscription, error_genre, datetime.now(), logger))
+    logger.info("Error log queued. subscription=%s error_genre=%s", subscription, error_genre)
+    return True
 
 def _error_genre_from_returncode(returncode: int) -> Optional[str]:
     return ERROR_EXIT_CODE_TO_GENRE.get(returncode)
@@ -144,32 +601,101 @@ def _retry_policy(error_genre: Optional[str], default_max_retries: int) -> Tuple
 
 def _save_queue_message(queue_dir: str, message_id: str, data: bytes, attributes: Dict[str, str]) -> Dict[str, Any]:
     safe_id = _sanitize_message_id(message_id)
-    ts_ms = int(time.time() * 1000)
+    now_ns = time.time_ns()
+    ts_ms = now_ns // 1_000_000
     suffix = uuid.uuid4().hex[:8]
-    path = os.path.join(queue_dir, f"{ts_ms}_{safe_id}_{suffix}.json")
+    base = os.path.join(queue_dir, f"{ts_ms}_{safe_id}_{suffix}")
+    path = base + QUEUE_META_SUFFIX
+    with open(base + QUEUE_DATA_SUFFIX, "wb") as fp:
+        fp.write(data or b"")
     payload = {
         "message_id": message_id,
-        "received_at": time.time(),
+        "received_at": now_ns / 1e9,
         "attributes": attributes,
-        "data_b64": base64.b64encode(data or b"").decode("ascii"),
         "attempts": 0,
     }
     _write_json(path, payload)
     payload["queue_path"] = path
     return payload
 
+def _queue_data_path(queue_path: str) -> Optional[str]:
+    if not queue_path.endswith(QUEUE_META_SUFFIX):
+        return None
+    return queue_path[: -len(QUEUE_META_SUFFIX)] + QUEUE_DATA_SUFFIX
+
+def _queue_events_path(queue_path: str) -> str:
+    if queue_path.endswith(QUEUE_META_SUFFIX):
+        return queue_path[: -len(QUEUE_META_SUFFIX)] + QUEUE_EVENTS_SUFFIX
+    return queue_path + QUEUE_EVENTS_SUFFIX
+
+def _append_queue_event(queue_path: str, line: str) -> None:
+    # the metadata file is never rewritten; attempts and errors are appended to a sidecar
+    fd = os.open(_queue_events_path(queue_path), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o666)
+    try:
+        os.write(fd, line.encode("utf-8"))
+    finally:
+        os.close(fd)
+
+def _record_queue_attempt(queue_payload: Dict[str, Any], at: float) -> None:
+    queue_payload["attempts"] = int(queue_payload.get("attempts", 0)) + 1
+    queue_payload["last_attempt_at"] = at
+    _append_queue_event(queue_payload["queue_path"], f"A{at:.3f}\n")
+
+def _record_queue_error(queue_payload: Dict[str, Any], reason: str, at: float) -> None:
+    queue_payload["last_error"] = reason
+    queue_payload["last_error_at"] = at
+    _append_queue_event(queue_payload["queue_path"], f"E{at:.3f} {reason}\n")
+
+def _apply_queue_events(payload: Dict[str, Any]) -> None:
+    try:
+        with open(_queue_events_path(payload["queue_path"]), "rb") as fp:
+            raw = fp.read()
+    except FileNotFoundError:
+        return
+    # a crash mid-append leaves the last line without its newline; that event was never recorded
+    lines = raw[:raw.rfind(b"\n") + 1].decode("utf-8").splitlines()
+    for line in lines:
+        kind, rest = line[:1], line[1:]
+        if kind == "A":
+            payload["attempts"] = int(payload.get("attempts", 0)) + 1
+            payload["last_attempt_at"] = float(rest)
+        elif kind == "E":
+            at, _, reason = rest.partition(" ")
+            payload["last_error"] = reason
+            payload["last_error_at"] = float(at)
+
+def _load_queue_data(payload: Dict[str, Any]) -> bytes:
+    if "data_b64" in payload:
+        # single-file entries written by older agents
+        return base64.b64decode(payload["data_b64"] or "")
+    data_path = _queue_data_path(payload["queue_path"])
+    if not data_path:
+        raise ValueError(f"Unknown queue file layout: {payload['queue_path']}")
+    with open(data_path, "rb") as fp:
+        return fp.read()
+
+def _remove_queue_files(queue_path: str) -> None:
+    os.remove(queue_path)
+    data_path = _queue_data_path(queue_path)
+    if data_path and os.path.exists(data_path):
+        os.remove(data_path)
+    events_path = _queue_events_path(queue_path)
+    if os.path.exists(events_path):
+        os.remove(events_path)
+
 def _load_queue_message(path: str) -> Optional[Dict[str, Any]]:
     try:
-        with open(path, "r", encoding="utf-8") as fp:
-            payload = json.load(fp)
+        with open(path, "rb") as fp:
+            payload = _json_loads(fp.read())
         payload["queue_path"] = path
+        _apply_queue_events(payload)
         return payload
     except Exception:
         return None
 
 def _parse_body(data: bytes, logger: logging.Logger, message_id: str) -> Dict[str, Any]:
     try:
-        return json.loads(data.decode("utf-8")) if data else {}
+        return _json_loads(data) if data else {}
     except Exception:
         raw = data.decode("utf-8", errors="replace") if data else ""
         logger.warning("JSON decode failed. message_id=%s raw=%s", message_id, raw)
@@ -187,48 +713,103 @@ def _parse_retry_count(attributes: Optional[Dict[str, str]], logger: logging.Log
         logger.warning("Invalid retry_count attribute: %s", raw)
         return 0
 
-def worker(project_id: str, subcfg: Dict[str, Any], credentials_path: Optional[str] = None):
+def _redelivery_backoff(consecutive_failures: int) -> int:
+    exponent = min(max(consecutive_failures - 1, 0), 16)
+    return min(REDELIVERY_BACKOFF_MAX_SEC, REDELIVERY_BACKOFF_BASE_SEC * (2 ** exponent))
+
+def _retry_enabled(subcfg: Dict[str, Any]) -> bool:
+    return bool(subcfg.get("retry_topic")) and int(subcfg.get("max_retries", 0) or 0) > 0
+
+def worker(
+    project_id: str,
+    subcfg: Dict[str, Any],
+    subscriber: pubsub_v1.SubscriberClient,
+    publisher: Optional[pubsub_v1.PublisherClient] = None,
+) -> Callable[[], Callable[[float], bool]]:
+    # non-blocking: starts the stream on the shared client and returns a function that stops it.
+    # stop() returns wait(timeout), which is True once no task is running on the executor.
     subscription = subcfg["subscription_name"]
     working_dir = subcfg["working_dir"]
     python_path = subcfg["python_path"]
-    extra_args = subcfg.get("extra_args", [])
+    extra_args = tuple(str(a) for a in subcfg.get("extra_args") or [])
     log_dir = subcfg.get("log_dir") or os.path.join(working_dir, "logs")
     logger = setup_logger(subscription, log_dir)
-    db_config = _load_db_config(working_dir, logger)
+    db_config = _load_db_config(logger)
+    error_log_pool = _ErrorLogPool(db_config, subscription, logger) if db_config else None
     queue_dir = _queue_dir_path(subcfg.get("queue_dir"), subscription, working_dir)
     logger.info("Queue dir initialized. path=%s", queue_dir)
     retry_topic = subcfg.get("retry_topic")
     max_retries = int(subcfg.get("max_retries", 0) or 0)
+    concurrency = max(1, int(subcfg.get("concurrency", 1) or 1))
+    crawler_env = _crawler_env(working_dir)
+    crawler_pool = None
+    if subcfg.get("persistent_worker"):
+        crawler_pool = CrawlerWorkerPool(
+            python_path,
+            working_dir,
+            crawler_env,
+            concurrency,
+            int(subcfg.get("persistent_worker_max_jobs") or PERSISTENT_WORKER_MAX_JOBS),
+            logger,
+        )
+    inflight_keys = set()
+    recent_keys = _RecentKeys(RECENT_JOB_MAXSIZE, RECENT_JOB_TTL_SEC)
+    inflight_lock = threading.Lock()
 
-    if credentials_path:
-        os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = credentials_path
-
+    # messages beyond concurrency wait in the executor while the client keeps extending their lease
+    max_messages = max(concurrency, int(subcfg.get("max_messages") or concurrency))
     flow_control = pubsub_v1.types.FlowControl(
-        max_messages=1,
-        max_lease_duration=24 * 3600,
+        max_messages=max_messages,
+        max_bytes=FLOW_CONTROL_MAX_BYTES,
+        # crawls run for hours; the client's 1h default would let them be redelivered mid-run
+        max_lease_duration=STREAM_MAX_LEASE_SEC,
     )
-    subscriber = pubsub_v1.SubscriberClient()
+    executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix=f"agent-{subscription}")
+    active_tasks = _ActiveTasks()
     sub_path = subscriber.subscription_path(project_id, subscription)
-    logger.info("Worker initialized. subscription=%s working_dir=%s python_path=%s", subscription, working_dir, python_path)
+    logger.info(
+        "Worker initialized. subscription=%s working_dir=%s python_path=%s concurrency=%s max_messages=%s",
+        subscription,
+        working_dir,
+        python_path,
+        concurrency,
+        max_messages,
+    )
 
-    publisher = None
     retry_topic_path = None
-    if retry_topic and max_retries > 0:
-        publisher = pubsub_v1.PublisherClient()
+    if not _retry_enabled(subcfg):
+        publisher = None
+    elif publisher:
         retry_topic_path = publisher.topic_path(project_id, retry_topic)
         logger.info("Retry publisher initialized. topic=%s max_retries=%s", retry_topic_path, max_retries)
 
+    def claim_job(key: Tuple[str, str]) -> Optional[str]:
+        # returns the skip reason, or None when the caller now owns the job
+        with inflight_lock:
+            if key in inflight_keys:
+                return "in flight"
+            if key in recent_keys:
+                return "recently done"
+            inflight_keys.add(key)
+            return None
+
+    def release_job(key: Tuple[str, str], completed: bool) -> None:
+        with inflight_lock:
+            inflight_keys.discard(key)
+            if completed:
+                recent_keys.add(key)
+
     def process_pending_queue():
         try:
-            entries = [p for p in os.listdir(queue_dir) if p.endswith(".json")]
+            with os.scandir(queue_dir) as it:
+                entries = [(entry.name, entry.path) for entry in it if entry.name.endswith(".json")]
         except FileNotFoundError:
             return
         if not entries:
             return
         entries.sort()
         logger.info("Processing pending queue. dir=%s count=%s", queue_dir, len(entries))
-        for name in entries:
-            path = os.path.join(queue_dir, name)
+        for name, path in entries:
             payload = _load_queue_message(path)
             if not payload:
                 bad_path = path + ".bad"
@@ -240,14 +821,25 @@ def worker(project_id: str, subcfg: Dict[str, Any], credentials_path: Optional[s
                 continue
             msg_id = payload.get("message_id", name)
             attributes = payload.get("attributes") or {}
-            data_b64 = payload.get("data_b64") or ""
             try:
-                data = base64.b64decode(data_b64)
+                data = _load_queue_data(payload)
             except Exception:
-                logger.exception("Queue file base64 decode failed. path=%s", path)
+                logger.exception("Queue data load failed. path=%s", path)
                 continue
             retry_count = _parse_retry_count(attributes, logger)
-            process_payload(msg_id, data, attributes, retry_count, payload, "queue")
+            key = _dedupe_key(msg_id, attributes)
+            skip_reason = claim_job(key)
+            if skip_reason:
+                logger.info("Duplicate job skipped (%s). message_id=%s key=%s", skip_reason, msg_id, key)
+                # the in-flight run may still fail and be redelivered, so keep this copy until it has completed
+                if skip_reason == "recently done":
+                    _remove_queue_files(path)
+                continue
+            try:
+                process_payload(msg_id, data, attributes, retry_count, payload, "queue", partial(release_job, key))
+            except Exception:
+                release_job(key, False)
+                raise
 
     def publish_retry(
         msg_id: str,
@@ -256,7 +848,9 @@ def worker(project_id: str, subcfg: Dict[str, Any], credentials_path: Optional[s
         retry_count: int,
         reason: str,
         error_genre: Optional[str],
+        on_result: Callable[[bool], None],
     ) -> bool:
+        # False: retry not applicable. True: on_result(published) will be called once the publish settles
         if not publisher or not retry_topic_path:
             logger.warning("Retry skipped (publisher not configured). message_id=%s reason=%s", msg_id, reason)
             return False
@@ -280,9 +874,14 @@ def worker(project_id: str, subcfg: Dict[str, Any], credentials_path: Optional[s
                 error_genre,
             )
             time.sleep(delay_seconds)
-        try:
-            future = publisher.publish(retry_topic_path, data or b"", **retry_attributes)
-            publish_id = future.result()
+
+        def on_published(future) -> None:
+            try:
+                publish_id = future.result()
+            except Exception:
+                logger.exception("Retry publish failed. message_id=%s retry_count=%s reason=%s", msg_id, next_count, reason)
+                on_result(False)
+                return
             logger.info(
                 "Retry published. message_id=%s retry_count=%s publish_id=%s reason=%s error_genre=%s",
                 msg_id,
@@ -291,10 +890,70 @@ def worker(project_id: str, subcfg: Dict[str, Any], credentials_path: Optional[s
                 reason,
                 error_genre,
             )
-            return True
+            on_result(True)
+
+        try:
+            future = publisher.publish(retry_topic_path, data or b"", **retry_attributes)
         except Exception:
             logger.exception("Retry publish failed. message_id=%s retry_count=%s reason=%s", msg_id, next_count, reason)
+            on_result(False)
+            return True
+        future.add_done_callback(on_published)
+        return True
+
+    redelivery_failures = [0]
+    redelivery_lock = threading.Lock()
+
+    def defer_redelivery(message: pubsub_v1.subscriber.message.Message, msg_id: str) -> None:
+        # nack() redelivers at once and can spin; hold the message back for a growing deadline instead
+        with redelivery_lock:
+            redelivery_failures[0] += 1
+            backoff = _redelivery_backoff(redelivery_failures[0])
+        message.modify_ack_deadline(backoff)
+        message.drop()
+        logger.warning("Redelivery deferred. message_id=%s backoff_sec=%s", msg_id, backoff)
+
+    def settle_message(
+        message: Optional[pubsub_v1.subscriber.message.Message],
+        msg_id: str,
+        queue_path: Optional[str],
+        redeliver: bool,
+    ) -> bool:
+        # True when the job is finished with (acked or handed over to a retry)
+        if message is None:
+            return not redeliver
+        if redeliver:
+            if queue_path and os.path.exists(queue_path):
+                _remove_queue_files(queue_path)
+                logger.info("Queue file removed before redelivery. message_id=%s path=%s", msg_id, queue_path)
+            defer_redelivery(message, msg_id)
             return False
+        message.ack()
+        with redelivery_lock:
+            redelivery_failures[0] = 0
+        logger.info("ACKed. message_id=%s", msg_id)
+        return True
+
+    def retry_or_settle(
+        msg_id: str,
+        data: bytes,
+        attributes: Dict[str, str],
+        retry_count: int,
+        reason: str,
+        error_genre: Optional[str],
+        message: Optional[pubsub_v1.subscriber.message.Message],
+        queue_path: Optional[str],
+        done: Callable[[bool], None],
+    ) -> None:
+        def on_retry_result(published: bool) -> None:
+            # runs on the publisher's callback thread; the message stays leased until then
+            if published and queue_path:
+                _remove_queue_files(queue_path)
+                logger.info("Queue file removed after retry publish. message_id=%s path=%s", msg_id, queue_path)
+            done(settle_message(message, msg_id, queue_path, not published))
+
+        if not publish_retry(msg_id, data, attributes, retry_count, reason, error_genre, on_retry_result):
+            done(settle_message(message, msg_id, queue_path, False))
 
     def process_payload(
         msg_id: str,
@@ -303,65 +962,89 @@ def worker(project_id: str, subcfg: Dict[str, Any], credentials_path: Optional[s
         retry_count: int,
         queue_payload: Optional[Dict[str, Any]],
         source: str,
+        done: Callable[[bool], None],
+        message: Optional[pubsub_v1.subscriber.message.Message] = None,
     ) -> None:
+        # done(completed) is called exactly once, possibly later from a publish callback
+        t0 = time.monotonic()
+        # one wall-clock read per attempt; a fresh subscription message was stamped moments ago at save
+        if source == "subscription" and queue_payload and "received_at" in queue_payload:
+            started_at = float(queue_payload["received_at"])
+        else:
+            started_at = time.time()
         queue_path = queue_payload.get("queue_path") if queue_payload else None
         if queue_payload and queue_path:
-            attempts = int(queue_payload.get("attempts", 0)) + 1
-            queue_payload["attempts"] = attempts
-            queue_payload["last_attempt_at"] = time.time()
-            _write_json(queue_path, queue_payload)
+            _record_queue_attempt(queue_payload, started_at)
         body = _parse_body(data, logger, msg_id)
-        cmd = build_command(python_path, body, extra_args, logger)
         try:
-            cmd_display = " ".join([f'\"{c}\"' if " " in str(c) else str(c) for c in cmd])
+            cmd, cmd_display = build_command(python_path, body, extra_args, logger)
+        except InvalidJobError as e:
+            logger.error("Invalid job. message_id=%s reason=%s ACK without retry.", msg_id, e)
+            if queue_path:
+                _remove_queue_files(queue_path)
+            done(settle_message(message, msg_id, None, False))
+            return
+        try:
             logger.info("Subprocess starting. message_id=%s source=%s cmd=%s", msg_id, source, cmd_display)
-            start = time.time()
-            result = subprocess.run(cmd, check=True, cwd=working_dir, capture_output=True, text=True)
-            elapsed = time.time() - start
+            if crawler_pool:
+                returncode = crawler_pool.run(cmd[2], cmd[3:])
+            else:
+                returncode = _run_subprocess(cmd, working_dir, crawler_env, logger)
+            if returncode != 0:
+                raise subprocess.CalledProcessError(returncode, cmd)
+            elapsed = time.monotonic() - t0
             logger.info("Subprocess finished. message_id=%s source=%s returncode=0 elapsed_sec=%.2f", msg_id, source, elapsed)
-            if result.stdout:
-                logger.info("stdout:\n%s", result.stdout.rstrip())
-            if result.stderr:
-                logger.warning("stderr:\n%s", result.stderr.rstrip())
             if queue_path:
-                os.remove(queue_path)
+                _remove_queue_files(queue_path)
                 logger.info("Queue file removed. message_id=%s path=%s", msg_id, queue_path)
             logger.info("Done. message_id=%s elapsed_sec=%.2f", msg_id, elapsed)
+            done(settle_message(message, msg_id, None, False))
         except subprocess.CalledProcessError as e:
-            elapsed = time.time() - start if "start" in locals() else None
-            if elapsed is not None:
-                logger.error("Subprocess failed. message_id=%s returncode=%s elapsed_sec=%.2f", msg_id, e.returncode, elapsed)
-            else:
-                logger.error("Subprocess failed. message_id=%s returncode=%s", msg_id, e.returncode)
-            if e.stdout:
-                logger.info("stdout:\n%s", e.stdout.rstrip())
-            if e.stderr:
-                logger.error("stderr:\n%s", e.stderr.rstrip())
+            elapsed = time.monotonic() - t0
+            logger.error("Subprocess failed. message_id=%s returncode=%s elapsed_sec=%.2f", msg_id, e.returncode, elapsed)
             error_genre = _error_genre_from_returncode(e.returncode)
             if error_genre:
-                _insert_error_log(db_config, subscription, error_genre, logger)
+                _insert_error_log(error_log_pool, subscription, error_genre, logger)
             if queue_payload and queue_path:
-                queue_payload["last_error"] = f"subprocess_failed:{e.returncode}"
-                queue_payload["last_error_at"] = time.time()
-                _write_json(queue_path, queue_payload)
-            published = publish_retry(msg_id, data, attributes, retry_count, "subprocess_failed", error_genre)
-            if published and queue_path:
-                os.remove(queue_path)
-                logger.info("Queue file removed after retry publish. message_id=%s path=%s", msg_id, queue_path)
+                _record_queue_error(queue_payload, f"subprocess_failed:{e.returncode}", started_at + elapsed)
+            retry_or_settle(msg_id, data, attributes, retry_count, "subprocess_failed", error_genre, message, queue_path, done)
         except Exception:
             logger.exception("Unexpected error. message_id=%s source=%s", msg_id, source)
             if queue_payload and queue_path:
-                queue_payload["last_error"] = "unexpected_error"
-                queue_payload["last_error_at"] = time.time()
-                _write_json(queue_path, queue_payload)
-            published = publish_retry(msg_id, data, attributes, retry_count, "unexpected_error", None)
-            if published and queue_path:
-                os.remove(queue_path)
-                logger.info("Queue file removed after retry publish. message_id=%s path=%s", msg_id, queue_path)
+                _record_queue_error(queue_payload, "unexpected_error", started_at + (time.monotonic() - t0))
+            retry_or_settle(msg_id, data, attributes, retry_count, "unexpected_error", None, message, queue_path, done)
 
     def callback(message: pubsub_v1.subscriber.message.Message):
+        with active_tasks:
+            handle_callback(message)
+
+    def handle_callback(message: pubsub_v1.subscriber.message.Message):
         msg_id = message.message_id
         attributes = dict(message.attributes or {})
+        key = _dedupe_key(msg_id, attributes)
+        skip_reason = claim_job(key)
+        if skip_reason == "in flight":
+            # acking now would lose the job if the running copy fails; ask again once it has had time to finish
+            message.modify_ack_deadline(DUPLICATE_DEFER_SEC)
+            message.drop()
+            logger.info("Duplicate job deferred (in flight). message_id=%s key=%s defer_sec=%s", msg_id, key, DUPLICATE_DEFER_SEC)
+            return
+        if skip_reason:
+            logger.info("Duplicate job skipped (%s). message_id=%s key=%s", skip_reason, msg_id, key)
+            message.ack()
+            return
+        try:
+            handle_message(message, attributes, partial(release_job, key))
+        except Exception:
+            release_job(key, False)
+            raise
+
+    def handle_message(
+        message: pubsub_v1.subscriber.message.Message,
+        attributes: Dict[str, str],
+        done: Callable[[bool], None],
+    ) -> None:
+        msg_id = message.message_id
         retry_count = _parse_retry_count(attributes, logger)
         logger.info("Callback start. message_id=%s retry_count=%s", msg_id, retry_count)
         data = message.data or b""
@@ -376,32 +1059,58 @@ def worker(project_id: str, subcfg: Dict[str, Any], credentials_path: Optional[s
             queue_payload = _save_queue_message(queue_dir, msg_id, data, attributes)
             logger.info("Queue saved. message_id=%s path=%s", msg_id, queue_payload.get("queue_path"))
         except Exception:
-            logger.exception("Queue save failed. message_id=%s NACK.", msg_id)
-            message.nack()
+            logger.exception("Queue save failed. message_id=%s", msg_id)
+            defer_redelivery(message, msg_id)
+            done(False)
             logger.info("Callback end. message_id=%s", msg_id)
             return
 
-        message.ack()
-        logger.info("ACKed early. message_id=%s", msg_id)
-
-        process_payload(msg_id, data, attributes, retry_count, queue_payload, "subscription")
+        process_payload(msg_id, data, attributes, retry_count, queue_payload, "subscription", done, message)
         logger.info("Callback end. message_id=%s", msg_id)
 
-    process_pending_queue()
+    def replay_pending_queue():
+        with active_tasks:
+            try:
+                process_pending_queue()
+            except Exception:
+                logger.exception("Pending queue processing failed. dir=%s", queue_dir)
+
+    # runs on the same executor as message callbacks, so it counts against concurrency
+    executor.submit(replay_pending_queue)
 
     streaming_pull_future = subscriber.subscribe(
         sub_path,
         callback=callback,
         flow_control=flow_control,
+        scheduler=ThreadScheduler(executor),
     )
+
+    def on_stream_done(future) -> None:
+        if future.cancelled():
+            return
+        try:
+            future.result()
+        except Exception as e:
+            logger.error("Stream error: %s", e)
+
+    streaming_pull_future.add_done_callback(on_stream_done)
     logger.info("Listening on %s ...", sub_path)
-    try:
-        streaming_pull_future.result()
-    except KeyboardInterrupt:
-        streaming_pull_future.cancel()
-    except Exception as e:
-        logger.error("Stream error: %s", e)
+
+    def stop() -> Callable[[float], bool]:
+        logger.info("Shutdown requested. subscription=%s", subscription)
         streaming_pull_future.cancel()
+        # queued callbacks are dropped (their messages are redelivered); running crawls are left to finish
+        executor.shutdown(wait=False, cancel_futures=True)
+        if crawler_pool:
+            crawler_pool.close()
+        return active_tasks.wait_idle
+
+    return stop
+
+def _restore_default_signals() -> None:
+    # after the first stop request a second Ctrl+C / SIGTERM terminates at once instead of being swallowed
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
 
 def main():
     cfg_path = Path(__file__).with_name("agent_config.json")
@@ -419,6 +1128,10 @@ def main():
         "max_retries": cfg.get("max_retries"),
         "queue_dir": cfg.get("queue_dir"),
         "log_dir": cfg.get("log_dir"),
+        "concurrency": cfg.get("concurrency"),
+        "max_messages": cfg.get("max_messages"),
+        "persistent_worker": cfg.get("persistent_worker"),
+        "persistent_worker_max_jobs": cfg.get("persistent_worker_max_jobs"),
     }
 
     if not subs:
@@ -431,20 +1144,53 @@ def main():
             "state_dir": cfg.get("state_dir")
         }]
 
-    threads = []
+    merged_subs = []
     for subcfg in subs:
         merged = dict(defaults)
         merged.update(subcfg)
-        t = threading.Thread(target=worker, args=(project_id, merged, credentials_path), daemon=True)
-        t.start()
-        threads.append(t)
+        merged_subs.append(merged)
+
+    _load_env_files([m["working_dir"] for m in merged_subs])
+    if credentials_path:
+        os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = credentials_path
+    subscriber = pubsub_v1.SubscriberClient()
+    publisher = pubsub_v1.PublisherClient() if any(_retry_enabled(m) for m in merged_subs) else None
+
+    stoppers = []
+    for merged in merged_subs:
+        try:
+            stoppers.append(worker(project_id, merged, subscriber, publisher))
+        except Exception as e:
+            print(f"[MAIN] Worker start failed. subscription={merged.get('subscription_name')} error={e}", file=sys.stderr)
+
+    stop = threading.Event()
+
+    def request_stop(*_) -> None:
+        stop.set()
+        _restore_default_signals()
 
-    print(f"[MAIN] Started {len(threads)} worker(s). Ctrl+C to exit.")
+    signal.signal(signal.SIGTERM, request_stop)
+    print(f"[MAIN] Started {len(stoppers)} worker(s). Ctrl+C to exit.")
     try:
-        while True:
-            time.sleep(60)
+        if os.name == "nt":
+            # Event.wait() is not interruptible by Ctrl+C on Windows
+            while not stop.is_set():
+                time.sleep(60)
+        else:
+            signal.signal(signal.SIGINT, request_stop)
+            stop.wait()
     except KeyboardInterrupt:
-        print("[MAIN] Shutting down...")
+        _restore_default_signals()
+    print("[MAIN] Shutting down...")
+    waiters = [stop_worker() for stop_worker in stoppers]
+    deadline = time.monotonic() + SHUTDOWN_TIMEOUT_SEC
+    busy = sum(1 for wait in waiters if not wait(max(0.0, deadline - time.monotonic())))
+    if busy:
+        # executor threads are non-daemon, so a normal exit would join every running crawl
+        print(f"[MAIN] {busy} worker(s) still busy after {SHUTDOWN_TIMEOUT_SEC}s. Forcing exit.", file=sys.stderr)
+        _stop_error_log_flusher()
+        _stop_log_listeners()
+        os._exit(1)
 
 if __name__ == "__main__":
     main()
@@ -2,7 +2,9 @@ import os
 from dotenv import load_dotenv
 
 # .envファイルの読み込み
-load_dotenv()
+# agent_multi から起動された場合は .env の内容を環境変数として受け取っているため再読込しない
+if not os.environ.get("CRAWLER_ENV_PRELOADED"):
+    load_dotenv()
 
 # データベース設定
 DB_CONFIG = {
@@ -3,9 +3,11 @@ import json
 import random
 import re
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import date, datetime, timedelta
+from functools import lru_cache
 from urllib.parse import urlparse
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from google.cloud import pubsub_v1
 from selenium.webdriver.common.by import By
@@ -14,7 +16,13 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
 from ..database.database import Database
-from ..database.models import CrawlerAccount, FavoriteUser, InstaHeavyRawData, InstaLightRawData
+from ..database.models import (
+    CrawlerAccount,
+    FavoriteUser,
+    InstaHeavyRawData,
+    ReelHeavyData,
+    ReelLightData,
+)
 from ..database.repositories import (
     InstaCrawlerAccountRepository,
     InstaFavoriteUserRepository,
@@ -23,10 +31,43 @@ from ..database.repositories import (
 from ..logger import setup_logger
 from .selenium_manager import SeleniumManager
 
+try:
+    import orjson
+
+    _encode_message = orjson.dumps
+except ImportError:  # orjson は任意。無い場合はエンコーダを使い回す標準 json で同じ JSON を作る
+    _json_encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+    def _encode_message(obj: Any) -> bytes:
+        return _json_encode(obj).encode("utf-8")
+
 logger = setup_logger(__name__)
 project_id = os.getenv("PROJECT_ID")
 RUN_MINUTES = 60
 REST_MINUTES = 30
+# 最終クロール時刻はこの人数ごとにまとめて DB へ反映する
+LAST_CRAWLED_FLUSH_SIZE = 10
+# Pub/Sub はクライアント側でまとめて送信し、終了時に未完了分の送信完了を待つ
+PUBLISH_BATCH_MAX_MESSAGES = 100
+PUBLISH_BATCH_MAX_LATENCY_SEC = 0.5
+PUBLISH_BATCH_MAX_BYTES = 1024 * 1024
+PUBLISH_DRAIN_TIMEOUT_SEC = 30
+
+# 「N秒前」などの相対表記: 接尾辞 -> (timedelta の引数名, 倍率)
+_RELATIVE_TIME_SUFFIXES = {
+    "秒前": ("seconds", 1),
+    "分前": ("minutes", 1),
+    "時間前": ("hours", 1),
+    "日前": ("days", 1),
+    "週間前": ("days", 7),
+}
+
+# 投稿ごとに呼ばれるため正規表現はモジュール読込時に一度だけコンパイルする
+_RE_YMD_JP = re.compile(r"(\d{4})年(\d{1,2})月(\d{1,2})日")
+# フォロワー数表示の「フォロワー」「人」・カンマ・空白を取り除く
+_RE_FOLLOWER_CLEAN = re.compile(r"[フォロワー人,\s]")
+# 「いいね！N」と「N件のいいね」「N件の「いいね」の各表記を1回の検索で拾う
+_RE_LIKE_COUNT = re.compile(r"いいね！\s*([\d.,万億]+)|([\d.,万億]+)\s*件の「?いいね")
 
 
 def parse_insta_time(time_text: str, base_time: datetime) -> Optional[datetime]:
@@ -36,24 +77,13 @@ def parse_insta_time(time_text: str, base_time: datetime) -> Optional[datetime]:
 
     text = time_text.strip()
     try:
-        if text.endswith("秒前"):
-            seconds = int(re.sub(r"秒前$", "", text))
-            return base_time - timedelta(seconds=seconds)
-        if text.endswith("分前"):
-            minutes = int(re.sub(r"分前$", "", text))
-            return base_time - timedelta(minutes=minutes)
-        if text.endswith("時間前"):
-            hours = int(re.sub(r"時間前$", "", text))
-            return base_time - timedelta(hours=hours)
-        if text.endswith("日前"):
-            days = int(re.sub(r"日前$", "", text))
-            return base_time - timedelta(days=days)
-        if text.endswith("週間前"):
-            weeks = int(re.sub(r"週間前$", "", text))
-            return base_time - timedelta(days=7 * weeks)
+        for suffix, (unit, factor) in _RELATIVE_TIME_SUFFIXES.items():
+            if text.endswith(suffix):
+                amount = int(text[: -len(suffix)])
+                return base_time - timedelta(**{unit: amount * factor})
 
         # 2024年5月17日 形式
-        m = re.match(r"(\d{4})年(\d{1,2})月(\d{1,2})日", text)
+        m = _RE_YMD_JP.match(text)
         if m:
             year, month, day = map(int, m.groups())
             return datetime(
@@ -78,6 +108,8 @@ def parse_insta_time(time_text: str, base_time: datetime) -> Optional[datetime]:
         return None
 
 
+# 一覧取得・詳細取得・マージで同じURLが繰り返し渡されるため結果をキャッシュする
+@lru_cache(maxsize=4096)
 def parse_insta_video_url(url: str) -> Tuple[str, str]:
     """InstagramのURLからvideo_idとuser_usernameを抽出する"""
     try:
@@ -92,20 +124,27 @@ def parse_insta_video_url(url: str) -> Tuple[str, str]:
         raise
 
 
+_NUMBER_SUFFIX_MULTIPLIERS = {"万": 10_000, "億": 100_000_000}
+
+
+# 再生数などは同じ表記（"1.2万" など）が繰り返し現れるため結果をキャッシュする
+@lru_cache(maxsize=1024)
 def parse_insta_number(text: str) -> Optional[int]:
     """Instagramの「万」「億」付き数字を整数へ変換する"""
     if not text:
         return None
 
     try:
-        clean_text = text.replace(",", "").strip()
+        clean_text = text.replace(",", "").strip() if "," in text else text.strip()
         if not clean_text:
             return None
-        if clean_text[-1] == "万":
-            return int(float(clean_text[:-1]) * 10_000)
-        if clean_text[-1] == "億":
-            return int(float(clean_text[:-1]) * 100_000_000)
-        if clean_text.replace(".", "").isdigit():
+        multiplier = _NUMBER_SUFFIX_MULTIPLIERS.get(clean_text[-1])
+        if multiplier:
+            return int(float(clean_text[:-1]) * multiplier)
+        # 整数表記が大半なので float を経由せずに変換する
+        if clean_text.isdigit():
+            return int(clean_text)
+        if "." in clean_text and clean_text.replace(".", "", 1).isdigit():
             return int(float(clean_text))
     except Exception:
         logger.warning(f"数字のパースに失敗: {text}", exc_info=True)
@@ -114,6 +153,18 @@ def parse_insta_number(text: str) -> Optional[int]:
     return None
 
 
+# 同じ日に投稿されたリールは同じ datetime 属性になりやすいため結果をキャッシュする
+@lru_cache(maxsize=2048)
+def _parse_iso_date(datetime_attr: str) -> Optional[date]:
+    try:
+        iso = datetime_attr.replace("Z", "+00:00")
+        parsed = datetime.fromisoformat(iso)
+        return parsed.date()
+    except Exception:
+        logger.warning(f"datetime属性のパースに失敗: {datetime_attr}", exc_info=True)
+        return None
+
+
 class InstaCrawler:
     BASE_URL = "https://www.instagram.com"
     PROFILE_CONTENT_SELECTOR = (
@@ -146,12 +197,128 @@ class InstaCrawler:
         "x8viiok.x1o7cslx"
     )
 
+    PROFILE_PHOTO_SELECTOR = "img[alt*='プロフィール写真'], img[alt$='のプロフィール写真']"
+    LEGACY_NICKNAME_SELECTOR = "header h1, header h2"
+    FOLLOWERS_COUNT_SELECTOR = "a[href$='/followers/'] span"
+    LOGIN_USERNAME_SELECTOR = (
+        "input[name='username'][aria-label*='電話番号'],"
+        "input[name='username'][aria-label*='ユーザーネーム'],"
+        "input[name='username'][aria-label*='メールアドレス'],"
+        "input[name='username']"
+    )
+    LOGIN_PASSWORD_SELECTOR = (
+        "input[name='password'][aria-label*='パスワード'],"
+        "input[name='password']"
+    )
+    LOGIN_SUBMIT_SELECTOR = "button[type='submit'], div button[type='submit']"
+
     # 閉じるボタン用セレクター（追加）
     CLOSE_BUTTON_SELECTOR = "svg[aria-label='閉じる']"
 
+    # find_element / WebDriverWait 用のロケーター（呼び出しのたびにタプルを組み立てない）
+    PROFILE_CONTENT_LOCATOR = (By.CSS_SELECTOR, PROFILE_CONTENT_SELECTOR)
+    REEL_ITEM_CONTAINER_LOCATOR = (By.CSS_SELECTOR, REEL_ITEM_CONTAINER_SELECTOR)
+    FOLLOWERS_COUNT_LOCATOR = (By.CSS_SELECTOR, FOLLOWERS_COUNT_SELECTOR)
+    LOGIN_USERNAME_LOCATOR = (By.CSS_SELECTOR, LOGIN_USERNAME_SELECTOR)
+    LOGIN_PASSWORD_LOCATOR = (By.CSS_SELECTOR, LOGIN_PASSWORD_SELECTOR)
+    LOGIN_SUBMIT_LOCATOR = (By.CSS_SELECTOR, LOGIN_SUBMIT_SELECTOR)
+    CLOSE_BUTTON_LOCATOR = (By.CSS_SELECTOR, CLOSE_BUTTON_SELECTOR)
+    BODY_LOCATOR = (By.TAG_NAME, "body")
+
+    # リール詳細の各項目を1回の execute_script でまとめて取得する
+    # タイトルは候補が複数あるため、最も長いテキストを採用する
+    HEAVY_DATA_EXTRACT_JS = """
+        const [timeSelector, titleSelector, audioSelector, commentSelector, commentLimit] = arguments;
+        const timeEl = document.querySelector(timeSelector);
+        let title = null;
+        for (const el of document.querySelectorAll(titleSelector)) {
+            const text = (el.innerText || el.textContent || "").trim();
+            if (text && (title === null || text.length > title.length)) {
+                title = text;
+            }
+        }
+        const audioEl = document.querySelector(audioSelector);
+        const comments = Array.from(document.querySelectorAll(commentSelector))
+            .slice(0, commentLimit)
+            .map((el) => el.innerText.trim())
+            .filter(Boolean);
+        return {
+            postTimeText: timeEl ? timeEl.innerText : null,
+            postTimeIso: timeEl ? timeEl.getAttribute("datetime") : null,
+            title: title,
+            audio: audioEl ? audioEl.innerText : null,
+            comments: comments,
+        };
+    """
+    # 待ち時間内にタイトルが描画されなかった場合に取り直す回数と間隔
+    HEAVY_DATA_RETRY_COUNT = 2
+    HEAVY_DATA_RETRY_INTERVAL_SEC = 0.5
+
+    # 指定インデックスのリールまでスクロールし、リンクをクリックして href を返す
+    REEL_ITEM_CLICK_JS = """
+        const [containerSelector, index] = arguments;
+        const item = document.querySelectorAll(containerSelector)[index];
+        const link = item ? item.querySelector("a[href*='/reel/']") : null;
+        if (!link) {
+            return null;
+        }
+        item.scrollIntoView({block: "center"});
+        link.click();
+        return link.href;
+    """
+
+    # 詳細取得ではテキストしか使わないため、block_media 時に読み込みを止めるメディアURL
+    # setBlockedURLs はURL全体に一致させるが、CDNのメディアURLには必ずクエリが付くため末尾にも * を付ける
+    BLOCKED_MEDIA_URL_PATTERNS = [
+        "*.mp4*", "*.jpg*", "*.jpeg*", "*.png*", "*.webp*", "*.gif*", "*.m4a*", "*.mp3*",
+    ]
+
+    # リール一覧の各アイテムを1回の execute_script でまとめて取得する
+    # サムネイルURLも style 属性の url(...) からブラウザ側で切り出して返す
+    REEL_GRID_EXTRACT_JS = """
+        const [containerSelector, viewSelector, thumbSelector, pinnedSelector, limit] = arguments;
+        const styleUrl = /url\\("?([^")]+)"?\\)/;
+        return Array.from(document.querySelectorAll(containerSelector)).slice(0, limit).map((el) => {
+            const link = el.querySelector("a[href*='/reel/']");
+            const view = el.querySelector(viewSelector);
+            const thumb = el.querySelector(thumbSelector);
+            const m = thumb ? (thumb.getAttribute("style") || "").match(styleUrl) : null;
+            return {
+                href: link ? link.href : null,
+                view: view ? view.innerText : "",
+                thumbnail: m ? m[1] : "",
+                pinned: el.querySelector(pinnedSelector) !== null,
+            };
+        });
+    """
+
+    # 新UIのニックネーム要素を優先し、空なら旧UIのヘッダー要素から、最初に見つかった表示名を返す
+    NICKNAME_EXTRACT_JS = """
+        for (const selector of arguments) {
+            for (const el of document.querySelectorAll(selector)) {
+                const text = (el.innerText || "").trim();
+                if (text) {
+                    return text;
+                }
+            }
+        }
+        return null;
+    """
+
+    # アクセス過多で一時的に制限されたときにページに表示される文言
+    RATE_LIMIT_MARKERS = (
+        "HTTP ERROR 429",
+        "数分してから",
+        "しばらくしてから",
+        "Please wait a few minutes",
+    )
+
     class InstaUserNotFoundException(Exception):
         pass
 
+    class InstaRateLimitedException(Exception):
+        pass
+
     def __init__(
         self,
         crawler_account_repo: InstaCrawlerAccountRepository,
@@ -166,6 +333,10 @@ class InstaCrawler:
         chrome_profile_directory: Optional[str] = None,
         skip_login: bool = False,
         use_proxy: bool = True,
+        heavy_tabs: int = 1,
+        block_media: bool = False,
+        proxies: Optional[List[str]] = None,
+        attach_to: Optional[str] = None,
     ):
         self.crawler_account_repo = crawler_account_repo
         self.favorite_user_repo = favorite_user_repo
@@ -175,6 +346,7 @@ class InstaCrawler:
         self.selenium_manager = None
         self.driver = None
         self.wait = None
+        self._fast_wait = None
         self.sadcaptcha_api_key = sadcaptcha_api_key
         self.login_restart_attempted = False
         self.engagement_type = engagement_type
@@ -184,9 +356,21 @@ class InstaCrawler:
         self.chrome_profile_directory = chrome_profile_directory
         self.skip_login = skip_login
         self.use_proxy = use_proxy
+        # アカウントのプロキシに加えて、アクセス制限時に順番に切り替える予備のプロキシ
+        self.proxies: List[str] = list(proxies or [])
+        # "host:port" を指定すると、Chrome を起動せず起動済みの Chrome に接続する
+        self.attach_to = attach_to
+        # 2以上のとき、詳細データはURL遷移方式で複数タブに先読みさせて取得する
+        self.heavy_tabs = max(1, heavy_tabs)
+        self._tab_handles: List[str] = []
+        # Trueのとき、ログイン後は画像・動画・音声の読み込みを CDP で止める
+        self.block_media = block_media
 
         self.publisher: Optional[pubsub_v1.PublisherClient] = None
         self._publisher_topic_path: Optional[str] = None
+        self._pending_publish_futures: List[Future] = []
+        # DB 書き込みを Selenium の操作と並行させるための専用スレッド（接続は1本なので1ワーカー）
+        self._db_executor: Optional[ThreadPoolExecutor] = None
 
     def __enter__(self):
         try:
@@ -207,6 +391,10 @@ class InstaCrawler:
             else:
                 proxy = None
 
+            proxies = [proxy] if proxy else []
+            if self.use_proxy:
+                proxies += [p for p in self.proxies if p not in proxies]
+
             self.selenium_manager = SeleniumManager(
                 proxy,
                 self.sadcaptcha_api_key,
@@ -214,18 +402,23 @@ class InstaCrawler:
                 use_profile=self.use_profile,
                 user_data_dir=self.chrome_user_data_dir,
                 profile_directory=self.chrome_profile_directory,
+                proxies=proxies,
+                attach_to=self.attach_to,
             )
-            self.driver = self.selenium_manager.setup_driver()
-            self.wait = WebDriverWait(self.driver, 15)
+            self._attach_driver(self.selenium_manager.setup_driver())
 
             if not self.skip_login:
+                # ログイン判定はプロフィール写真の表示を見るため、ログインが済むまではメディアを止めない
                 self._login()
                 self.crawler_account_repo.update_crawler_account_last_crawled(
                     self.crawler_account.id, datetime.now()
                 )
             else:
-                self.driver.get(self.BASE_URL)
+                self._goto(self.BASE_URL)
                 self._random_sleep(2.0, 3.0)
+                logger.info(f"ログイン状態: {'ログイン済み' if self._is_logged_in() else '未ログイン'}")
+            if self.block_media:
+                self._set_media_blocking(True)
             return self
         except Exception:
             self._cleanup_resources()
@@ -234,7 +427,54 @@ class InstaCrawler:
     def __exit__(self, exc_type, exc_val, exc_tb):
         self._cleanup_resources()
 
+    def _attach_driver(self, driver):
+        self.driver = driver
+        self.wait = WebDriverWait(self.driver, 15)
+        # リール詳細のようにすぐ描画される要素は、短い間隔でポーリングして待ち時間の余りを減らす
+        self._fast_wait = WebDriverWait(self.driver, 8, poll_frequency=0.1)
+        self._tab_handles = []
+
+    def rotate_proxy(self) -> bool:
+        """
+        アクセス制限を受けたときに次のプロキシでブラウザを立ち上げ直す。
+        切り替え先のプロキシがなければ False を返す。
+        """
+        if not self.selenium_manager:
+            return False
+        driver = self.selenium_manager.rotate_proxy()
+        if driver is None:
+            return False
+        self._attach_driver(driver)
+        if not self.skip_login:
+            self._login()
+        if self.block_media:
+            self._set_media_blocking(True)
+        return True
+
+    def _is_rate_limited(self, body_text: str) -> bool:
+        return any(marker in body_text for marker in self.RATE_LIMIT_MARKERS)
+
+    def ensure_session(self):
+        """
+        休憩明けなどにブラウザセッションを使い回す。
+        セッションが落ちていた場合だけ Chrome を立ち上げ直してログインし直す。
+        """
+        try:
+            self.driver.current_url
+        except Exception:
+            logger.warning("ブラウザセッションが失われていたため再起動します")
+            self._cleanup_resources()
+            self.__enter__()
+            return
+        if not self.skip_login:
+            self.crawler_account_repo.update_crawler_account_last_crawled(
+                self.crawler_account.id, datetime.now()
+            )
+
     def _cleanup_resources(self):
+        if self._db_executor:
+            self._db_executor.shutdown(wait=True)
+            self._db_executor = None
         if self.selenium_manager:
             try:
                 self.selenium_manager.quit_driver()
@@ -244,7 +484,10 @@ class InstaCrawler:
                 self.selenium_manager = None
                 self.driver = None
                 self.wait = None
+                self._fast_wait = None
+                self._tab_handles = []
         if self.publisher:
+            self._drain_pending_publishes()
             try:
                 close = getattr(self.publisher, "close", None)
                 if callable(close):
@@ -262,13 +505,28 @@ class InstaCrawler:
     def _init_publisher(self):
         if self.publisher:
             return
-        self.publisher = pubsub_v1.PublisherClient()
+        self.publisher = pubsub_v1.PublisherClient(
+            batch_settings=pubsub_v1.types.BatchSettings(
+                max_messages=PUBLISH_BATCH_MAX_MESSAGES,
+                max_latency=PUBLISH_BATCH_MAX_LATENCY_SEC,
+                max_bytes=PUBLISH_BATCH_MAX_BYTES,
+            )
+        )
         # Instagram用: insta_video_master向けのトピックを利用
         self._publisher_topic_path = self.publisher.topic_path(
             project_id, "insta-video-master-sync"
         )
 
     def _publish_video_master_sync(self, message_data: Dict):
+        self._publish_video_master_bulk([message_data])
+
+    def _publish_video_master_bulk(self, messages: List[Dict]):
+        """
+        メッセージをまとめて Pub/Sub クライアントに渡す。
+        実際の送信はクライアントのバッチ設定で複数件ずつ行われ、完了は待たずにコールバックでログに残す。
+        """
+        if not messages:
+            return
         if not project_id:
             logger.warning("PROJECT_ID が設定されていないため、Pub/Sub 送信をスキップします")
             return
@@ -279,28 +537,91 @@ class InstaCrawler:
             if not self._publisher_topic_path:
                 logger.warning("Pub/Sub トピックパスが未設定のため送信をスキップします")
                 return
+        except Exception as e:
+            logger.error(f"Pub/Sub 送信に失敗しました: {e}", exc_info=True)
+            return
 
-            message_data.setdefault("target_table", "insta_video_master")
-            message_bytes = json.dumps(message_data).encode("utf-8")
-            future = self.publisher.publish(self._publisher_topic_path, message_bytes)
+        publish = self.publisher.publish
+        topic_path = self._publisher_topic_path
+        futures: List[Future] = []
+        for message_data in messages:
+            try:
+                message_data.setdefault("target_table", "insta_video_master")
+                future = publish(topic_path, _encode_message(message_data))
+                future.add_done_callback(self._on_publish_done)
+                futures.append(future)
+            except Exception as e:
+                logger.error(f"Pub/Sub 送信に失敗しました: {e}", exc_info=True)
+
+        self._pending_publish_futures = [
+            f for f in self._pending_publish_futures if not f.done()
+        ]
+        self._pending_publish_futures.extend(futures)
+
+    def _on_publish_done(self, future: Future):
+        try:
             message_id = future.result()
             logger.info(f"Pub/Sub メッセージを送信しました: {message_id}")
         except Exception as e:
             logger.error(f"Pub/Sub 送信に失敗しました: {e}", exc_info=True)
 
+    def _drain_pending_publishes(self):
+        """未完了の Pub/Sub 送信が終わるまで待つ（失敗はコールバック側でログ済み）"""
+        pending, self._pending_publish_futures = self._pending_publish_futures, []
+        for future in pending:
+            try:
+                future.result(timeout=PUBLISH_DRAIN_TIMEOUT_SEC)
+            except Exception:
+                pass
+
     def _random_sleep(self, min_seconds: float = 1.0, max_seconds: float = 3.0):
         time.sleep(random.uniform(min_seconds, max_seconds))
 
-    def _parse_datetime_attr(self, datetime_attr: Optional[str]) -> Optional[date]:
-        if not datetime_attr:
-            return None
+    def _goto(self, url: str) -> bool:
+        """現在のURLが遷移先と同じなら再読み込みせず False を返す"""
+        if self.driver.current_url.rstrip("/") == url.rstrip("/"):
+            return False
+        self.driver.get(url)
+        return True
+
+    def _wait_ready(self, jitter: Tuple[float, float] = (0.2, 0.6), timeout: float = 5):
+        """ページの読み込み完了まで待ち、人間らしさのために短いランダム待機だけを足す"""
         try:
-            iso = datetime_attr.replace("Z", "+00:00")
-            parsed = datetime.fromisoformat(iso)
-            return parsed.date()
+            WebDriverWait(self.driver, timeout).until(
+                lambda d: d.execute_script("return document.readyState;") == "complete"
+            )
+        except TimeoutException:
+            logger.debug("document.readyState が complete になる前にタイムアウトしました")
+        self._random_sleep(*jitter)
+
+    def _set_media_blocking(self, enabled: bool):
+        """CDP の Network.setBlockedURLs でメディアの読み込みを止める／再開する"""
+        urls = self.BLOCKED_MEDIA_URL_PATTERNS if enabled else []
+        try:
+            self.driver.execute_cdp_cmd("Network.enable", {})
+            self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": urls})
+            logger.debug(f"メディアの読み込みブロックを{'有効' if enabled else '無効'}にしました")
         except Exception:
-            logger.warning(f"datetime属性のパースに失敗: {datetime_attr}", exc_info=True)
+            logger.warning("CDP によるメディアブロックの設定に失敗しました", exc_info=True)
+
+    def _parse_datetime_attr(self, datetime_attr: Optional[str]) -> Optional[date]:
+        if not datetime_attr:
             return None
+        return _parse_iso_date(datetime_attr)
+
+    def _is_logged_in(self) -> bool:
+        """ログイン後にだけ表示される自分のプロフィール写真があるかを JS 1回で確認する"""
+        return bool(
+            self.driver.execute_script(
+                "return document.querySelector(arguments[0]) !== null;",
+                self.PROFILE_PHOTO_SELECTOR,
+            )
+        )
+
+    def _wait_until_logged_in(self, timeout: float):
+        WebDriverWait(self.driver, timeout, poll_frequency=0.1).until(
+            lambda d: self._is_logged_in()
+        )
 
     def _login(self):
         logger.info(
@@ -308,32 +629,20 @@ class InstaCrawler:
         )
         if self.use_profile:
             logger.info("事前構成済みのChromeプロファイルでログイン状態を確認します")
-            self.driver.get(self.BASE_URL)
+            self._goto(self.BASE_URL)
             self._random_sleep(2.0, 4.0)
             try:
-                WebDriverWait(self.driver, 15).until(
-                    EC.presence_of_element_located(
-                        (By.CSS_SELECTOR, "img[alt*='プロフィール写真'], img[alt$='のプロフィール写真']")
-                    )
-                )
+                self._wait_until_logged_in(15)
                 logger.info("既存プロフィールでログイン済みでした")
                 return
             except TimeoutException:
                 logger.info("ログイン状態を確認できなかったためフォーム入力を実施します")
 
-        self.driver.get(f"{self.BASE_URL}/accounts/login/")
+        self._goto(f"{self.BASE_URL}/accounts/login/")
         self._random_sleep(2.0, 4.0)
 
         username_input = self.wait.until(
-            EC.element_to_be_clickable(
-                (
-                    By.CSS_SELECTOR,
-                    "input[name='username'][aria-label*='電話番号'],"
-                    "input[name='username'][aria-label*='ユーザーネーム'],"
-                    "input[name='username'][aria-label*='メールアドレス'],"
-                    "input[name='username']",
-                )
-            )
+            EC.element_to_be_clickable(self.LOGIN_USERNAME_LOCATOR)
         )
         self._random_sleep(1.5, 2.5)
         username_input.clear()
@@ -341,30 +650,20 @@ class InstaCrawler:
 
         self._random_sleep(1.5, 2.5)
         password_input = self.wait.until(
-            EC.element_to_be_clickable(
-                (
-                    By.CSS_SELECTOR,
-                    "input[name='password'][aria-label*='パスワード'],"
-                    "input[name='password']",
-                )
-            )
+            EC.element_to_be_clickable(self.LOGIN_PASSWORD_LOCATOR)
         )
         password_input.clear()
         password_input.send_keys(self.crawler_account.password)
 
         self._random_sleep(1.5, 2.5)
         login_button = self.wait.until(
-            EC.element_to_be_clickable((By.CSS_SELECTOR, "button[type='submit'], div button[type='submit']"))
+            EC.element_to_be_clickable(self.LOGIN_SUBMIT_LOCATOR)
         )
         self._random_sleep(2.0, 3.0)
         login_button.click()
 
         try:
-            WebDriverWait(self.driver, 60).until(
-                EC.presence_of_element_located(
-                    (By.CSS_SELECTOR, "img[alt*='プロフィール写真'], img[alt$='のプロフィール写真']")
-                )
-            )
+            self._wait_until_logged_in(60)
             logger.info("Instagramへのログインに成功しました")
         except TimeoutException:
             logger.error("Instagramへのログインに失敗しました")
@@ -372,18 +671,18 @@ class InstaCrawler:
 
     def navigate_to_user_page(self, username: str):
         logger.debug(f"ユーザー @{username} のページへ遷移します")
-        self.driver.get(f"{self.BASE_URL}/{username}/")
+        self._goto(f"{self.BASE_URL}/{username}/")
         self._random_sleep(2.0, 4.0)
         try:
             self.wait.until(
-                EC.presence_of_element_located(
-                    (By.CSS_SELECTOR, self.PROFILE_CONTENT_SELECTOR)
-                )
+                EC.presence_of_element_located(self.PROFILE_CONTENT_LOCATOR)
             )
         except TimeoutException:
-            body_text = self.driver.find_element(By.TAG_NAME, "body").text
+            body_text = self.driver.find_element(*self.BODY_LOCATOR).text
             if "ご利用いただけません" in body_text or "リンクが切れている" in body_text:
                 raise self.InstaUserNotFoundException(f"ユーザー @{username} は存在しません")
+            if self._is_rate_limited(body_text):
+                raise self.InstaRateLimitedException(f"ユーザー @{username} の表示でアクセス制限を受けました")
             raise
         logger.debug(f"ユーザーページ @{username} の読み込みが完了しました")
 
@@ -391,169 +690,134 @@ class InstaCrawler:
         reels_path = f"/{username}/reels/"
         reels_url = f"{self.BASE_URL}{reels_path}"
         logger.debug(f"リールページ @{username} に遷移します")
-        self._random_sleep(1.5, 2.5)
-        try:
-            reels_tab = WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, f"a[href$='{reels_path}']"))
-            )
-            reels_tab.click()
+        if self.driver.current_url.rstrip("/").endswith(reels_path.rstrip("/")):
+            logger.debug("既にリールページにいるため遷移を省略します")
+        else:
             self._random_sleep(1.5, 2.5)
-        except TimeoutException:
-            logger.info("リールタブが見つからないため、URLに直接遷移します")
-            self.driver.get(reels_url)
+            try:
+                reels_tab = WebDriverWait(self.driver, 10).until(
+                    EC.element_to_be_clickable((By.CSS_SELECTOR, f"a[href$='{reels_path}']"))
+                )
+                reels_tab.click()
+                self._wait_ready()
+            except TimeoutException:
+                logger.info("リールタブが見つからないため、URLに直接遷移します")
+                self._goto(reels_url)
 
-        if not self.driver.current_url.rstrip("/").endswith(reels_path.rstrip("/")):
-            self.driver.get(reels_url)
+            if not self.driver.current_url.rstrip("/").endswith(reels_path.rstrip("/")):
+                self._goto(reels_url)
 
         try:
             self.wait.until(
-                EC.presence_of_element_located(
-                    (By.CSS_SELECTOR, self.REEL_ITEM_CONTAINER_SELECTOR)
-                )
+                EC.presence_of_element_located(self.REEL_ITEM_CONTAINER_LOCATOR)
             )
         except TimeoutException:
             logger.warning("リールタブのコンテンツが読み込めませんでした")
-        self._random_sleep(1.5, 2.5)
+        self._wait_ready()
+
+    def _count_elements(self, selector: str) -> int:
+        """要素数だけを取得する（find_elements のように全要素のハンドルを受け取らない）"""
+        return int(
+            self.driver.execute_script(
+                "return document.querySelectorAll(arguments[0]).length;", selector
+            )
+            or 0
+        )
 
     def scroll_user_page(self, need_items_count: int = 100, max_scroll_attempts: int = None) -> bool:
         logger.debug(f"{need_items_count} 件以上の投稿を目標にユーザーページをスクロールします")
         attempts = max_scroll_attempts or max(need_items_count // 3, 5)
         for _ in range(attempts):
-            posts = self.driver.find_elements(By.CSS_SELECTOR, "article a[href*='/p/']")
-            if len(posts) >= need_items_count:
+            if self._count_elements("article a[href*='/p/']") >= need_items_count:
                 return True
             self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
             self._random_sleep(1.5, 2.5)
-        return len(self.driver.find_elements(By.CSS_SELECTOR, "article a[href*='/p/']")) >= need_items_count
+        return self._count_elements("article a[href*='/p/']") >= need_items_count
 
     def scroll_reels_page(self, need_items_count: int = 100, max_scroll_attempts: int = None) -> bool:
         logger.debug(f"{need_items_count} 件以上のリールを目標にスクロールします")
         attempts = max_scroll_attempts or max(need_items_count // 3, 5)
         for _ in range(attempts):
-            items = self.driver.find_elements(By.CSS_SELECTOR, self.REEL_ITEM_CONTAINER_SELECTOR)
-            if len(items) >= need_items_count:
+            if self._count_elements(self.REEL_ITEM_CONTAINER_SELECTOR) >= need_items_count:
                 return True
             self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
             self._random_sleep(1.5, 2.5)
-        return len(self.driver.find_elements(By.CSS_SELECTOR, self.REEL_ITEM_CONTAINER_SELECTOR)) >= need_items_count
+        return self._count_elements(self.REEL_ITEM_CONTAINER_SELECTOR) >= need_items_count
 
 
     def get_video_heavy_data_from_video_page(
         self, fetch_comments: bool = True, comment_limit: int = 20
-    ) -> Dict[str, Optional[str]]:
+    ) -> ReelHeavyData:
         logger.debug("リール詳細ページから詳細情報を取得します")
-        heavy_data: Dict[str, Optional[str]] = {
-            "video_url": self.driver.current_url,
-            "post_time_text": None,
-            "post_time_iso": None,
-            "audio_info_text": None,
-            "video_title": None,
-            "comments_json": None,
-        }
+        heavy_data = ReelHeavyData(video_url=self.driver.current_url)
+
+        # 項目ごとに presence を待つと、セレクターの数だけ chromedriver へのポーリングが走るため、
+        # 全項目を1回の JS で取り出し、投稿日とタイトルが描画されたことを読み込み完了の目安にする
+        # （音源はリールによっては存在しないため条件にしない）
+        snapshot: Dict = {}
+
+        def take_snapshot(driver) -> bool:
+            nonlocal snapshot
+            snapshot = driver.execute_script(
+                self.HEAVY_DATA_EXTRACT_JS,
+                self.VIDEO_POST_TIME_SELECTOR,
+                self.VIDEO_TITLE_SELECTOR,
+                self.VIDEO_AUDIO_INFO_SELECTOR,
+                self.VIDEO_COMMENTS_SELECTOR,
+                comment_limit if fetch_comments else 0,
+            ) or {}
+            return snapshot.get("postTimeText") is not None and snapshot.get("title") is not None
 
         try:
-            time_elem = self.wait.until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, self.VIDEO_POST_TIME_SELECTOR))
-            )
-            heavy_data["post_time_text"] = time_elem.text
-            heavy_data["post_time_iso"] = time_elem.get_attribute("datetime")
+            self._fast_wait.until(take_snapshot)
         except TimeoutException:
-            logger.warning("投稿日タイムスタンプの取得に失敗しました", exc_info=True)
-
-        try:
-            # 複数のタイトル候補から最も長いテキストを持つものを選択
-            video_title_selector = self.VIDEO_TITLE_SELECTOR
-
-            def get_best_title(driver):
-                try:
-                    h1_elements = driver.find_elements(By.CSS_SELECTOR, video_title_selector)
-                    if not h1_elements:
-                        return False
-
-                    best_title = None
-                    max_length = 0
-
-                    for elem in h1_elements:
-                        raw_title = (
-                            elem.get_attribute("innerText")
-                            or elem.get_attribute("textContent")
-                            or ""
-                        )
-                        text_length = len(raw_title.strip())
-
-                        if text_length > max_length:
-                            max_length = text_length
-                            best_title = raw_title.strip()
-
-                    return best_title if best_title else False
-                except Exception:
-                    return False
+            logger.warning("投稿日タイムスタンプ・タイトルの取得がタイムアウトしました", exc_info=True)
 
-            title_text = self.wait.until(get_best_title)
-            if title_text:
-                heavy_data["video_title"] = title_text
-            else:
-                heavy_data["video_title"] = None
-            logger.debug("video_title取得 (best_title): %s", title_text)
-        except TimeoutException:
+        for _ in range(self.HEAVY_DATA_RETRY_COUNT):
+            if snapshot.get("title") is not None:
+                break
+            time.sleep(self.HEAVY_DATA_RETRY_INTERVAL_SEC)
+            try:
+                take_snapshot(self.driver)
+            except Exception:
+                logger.debug("詳細データの再取得に失敗しました", exc_info=True)
+                break
+
+        heavy_data.post_time_text = snapshot.get("postTimeText")
+        heavy_data.post_time_iso = snapshot.get("postTimeIso")
+        heavy_data.video_title = snapshot.get("title")
+        logger.debug("video_title取得 (best_title): %s", heavy_data.video_title)
+        if heavy_data.video_title is None:
             logger.debug("動画タイトルが見つかりませんでした")
-
-        try:
-            audio_elem = self.wait.until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, self.VIDEO_AUDIO_INFO_SELECTOR))
-            )
-            heavy_data["audio_info_text"] = audio_elem.text
-        except TimeoutException:
+        heavy_data.audio_info_text = snapshot.get("audio")
+        if heavy_data.audio_info_text is None:
             logger.debug("音源情報が見つかりませんでした")
 
-        if fetch_comments:
-            comments: List[str] = []
-            try:
-                comment_elems = self.driver.find_elements(By.CSS_SELECTOR, self.VIDEO_COMMENTS_SELECTOR)
-                for elem in comment_elems[:comment_limit]:
-                    text = elem.text.strip()
-                    if text:
-                        comments.append(text)
-                if comments:
-                    heavy_data["comments_json"] = json.dumps(comments, ensure_ascii=False)
-            except Exception:
-                logger.warning("コメント取得でエラーが発生しました", exc_info=True)
+        comments = snapshot.get("comments") or []
+        if fetch_comments and comments:
+            heavy_data.comments_json = json.dumps(comments, ensure_ascii=False)
 
         return heavy_data
 
-    def _scroll_to_element(self, element):
-        """要素が見える位置までスクロールする"""
-        try:
-            self.driver.execute_script(
-                "arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});",
-                element
-            )
-            self._random_sleep(0.5, 1.0)
-        except Exception:
-            logger.warning("要素へのスクロールに失敗しました", exc_info=True)
-
     def _click_reel_item_by_index(self, index: int) -> bool:
         """リールページで指定インデックスのリール要素をクリックして詳細ページに遷移する"""
         try:
-            reel_items = self.driver.find_elements(By.CSS_SELECTOR, self.REEL_ITEM_CONTAINER_SELECTOR)
-            if index >= len(reel_items):
-                logger.warning(f"リール要素が見つかりません: index={index}, 現在の要素数={len(reel_items)}")
+            # 要素取得・スクロール・リンクのクリックを1回の JS で行う
+            # （往復が減るうえ、取得からクリックまでの間に要素が stale になることもない）
+            href = self.driver.execute_script(
+                self.REEL_ITEM_CLICK_JS, self.REEL_ITEM_CONTAINER_SELECTOR, index
+            )
+            if not href:
+                logger.warning(
+                    f"リール要素が見つかりません: index={index}, "
+                    f"現在の要素数={self._count_elements(self.REEL_ITEM_CONTAINER_SELECTOR)}"
+                )
                 return False
-            
-            target_elem = reel_items[index]
-            
-            # 要素の位置までスクロール
-            self._scroll_to_element(target_elem)
-            self._random_sleep(0.8, 1.5)
-            
-            # リール内のリンク要素をクリック
-            link_elem = target_elem.find_element(By.CSS_SELECTOR, "a[href*='/reel/']")
-            link_elem.click()
-            self._random_sleep(2.0, 3.5)
+            self._wait_ready()
             
             # 詳細ページへの遷移を確認（閉じるボタンが表示されることで確認）
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, self.CLOSE_BUTTON_SELECTOR))
+            self._fast_wait.until(
+                EC.presence_of_element_located(self.CLOSE_BUTTON_LOCATOR)
             )
             return True
         except TimeoutException:
@@ -564,65 +828,87 @@ class InstaCrawler:
             return False
 
     def _click_close_button_to_return(self, username: str):
-        """閉じるボタン（×）をクリックしてリールページに戻る"""
+        """リール詳細を閉じてリールページに戻る"""
         try:
-            # 閉じるボタン（svg）を探す
-            close_svg = WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, self.CLOSE_BUTTON_SELECTOR))
+            is_detail_url, has_close_button = self.driver.execute_script(
+                "return [location.pathname.indexOf('/reel/') !== -1,"
+                " document.querySelector(arguments[0]) !== null];",
+                self.CLOSE_BUTTON_SELECTOR,
             )
-            
-            # svgの親要素（div[role="button"]）を取得してクリック
-            close_button = close_svg.find_element(By.XPATH, "./ancestor::div[@role='button']")
-            close_button.click()
-            self._random_sleep(1.5, 2.5)
-            
-            # リールページに戻れたか確認
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, self.REEL_ITEM_CONTAINER_SELECTOR))
+            if is_detail_url:
+                # 詳細はURLルーティングされたオーバーレイなので、閉じるボタンを探さず履歴を1つ戻す
+                self.driver.execute_script("window.history.back();")
+            elif has_close_button:
+                # URL が変わっていないオーバーレイで履歴を戻るとリールページ自体を離れるため、閉じるボタンで閉じる
+                close_svg = self.driver.find_element(*self.CLOSE_BUTTON_LOCATOR)
+                close_svg.find_element(By.XPATH, "./ancestor::div[@role='button']").click()
+            elif self._count_elements(self.REEL_ITEM_CONTAINER_SELECTOR):
+                # 詳細が開いていない（遷移に失敗した）ときは戻る必要がない
+                return
+            else:
+                self._fallback_navigate_to_reels_page(username)
+                return
+
+            # オーバーレイの裏にも一覧は残っているため、閉じるボタンが消えたことまで確認する
+            self._fast_wait.until(
+                lambda d: d.execute_script(
+                    "return document.querySelector(arguments[0]) !== null"
+                    " && document.querySelector(arguments[1]) === null;",
+                    self.REEL_ITEM_CONTAINER_SELECTOR,
+                    self.CLOSE_BUTTON_SELECTOR,
+                )
             )
-            logger.debug("閉じるボタンでリールページに戻りました")
-            
+            self._random_sleep(1.5, 2.5)
+            logger.debug("リール詳細を閉じてリールページに戻りました")
+
         except TimeoutException:
-            logger.warning("閉じるボタンが見つからないか、リールページへの復帰がタイムアウトしました")
+            logger.warning("リールページへの復帰がタイムアウトしました")
             # フォールバック: URL直接遷移
             self._fallback_navigate_to_reels_page(username)
         except Exception:
-            logger.warning("閉じるボタンでの遷移に失敗しました", exc_info=True)
+            logger.warning("リール詳細を閉じる遷移に失敗しました", exc_info=True)
             self._fallback_navigate_to_reels_page(username)
 
     def _fallback_navigate_to_reels_page(self, username: str):
         """フォールバック: URL遷移でリールページに戻る"""
         logger.debug("URL遷移でリールページに戻ります")
+        # 一覧が壊れている可能性があるので、同じURLでも必ず再読み込みする
         self.driver.get(f"{self.BASE_URL}/{username}/reels/")
-        self._random_sleep(2.0, 3.0)
+        self._wait_ready()
         try:
             WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, self.REEL_ITEM_CONTAINER_SELECTOR))
+                EC.presence_of_element_located(self.REEL_ITEM_CONTAINER_LOCATOR)
             )
         except TimeoutException:
             logger.warning("リールページへのURL遷移後、要素が見つかりませんでした")
 
     def collect_reel_heavy_data_map(
-        self, light_like_datas: List[Dict], user_username: str = None,
+        self, light_like_datas: List[ReelLightData], user_username: str = None,
         fetch_comments: bool = True, comment_limit: int = 20,
         skip_video_ids: Optional[Set[str]] = None
-    ) -> Dict[str, Dict[str, Optional[str]]]:
+    ) -> Dict[str, ReelHeavyData]:
         """
         リール詳細データを収集する。
         各リールについて、ユーザーリールページからスクロール＋クリックで遷移し、
         詳細取得後は閉じるボタンでリールページに戻る。
         """
-        heavy_map: Dict[str, Dict[str, Optional[str]]] = {}
+        heavy_map: Dict[str, ReelHeavyData] = {}
         skip_video_ids = skip_video_ids or set()
         
         if not user_username and light_like_datas:
-            user_username = light_like_datas[0].get("user_username")
+            user_username = light_like_datas[0].user_username
         
         if not user_username:
             logger.warning("user_usernameが不明なため、URL遷移方式にフォールバックします")
             return self._collect_reel_heavy_data_map_by_url(
                 light_like_datas, fetch_comments, comment_limit, skip_video_ids
             )
+
+        if self.heavy_tabs > 1:
+            # 複数タブでの先読みはURL遷移が前提なので、クリック方式は使わない
+            return self._collect_reel_heavy_data_map_by_url(
+                light_like_datas, fetch_comments, comment_limit, skip_video_ids
+            )
         
         # リールページにいることを確認（いなければ遷移）
         reels_path = f"/{user_username}/reels/"
@@ -633,8 +919,8 @@ class InstaCrawler:
         self.scroll_reels_page(len(light_like_datas))
         
         for index, like_data in enumerate(light_like_datas):
-            video_url = like_data.get("video_url")
-            video_id = like_data.get("video_id")
+            video_url = like_data.video_url
+            video_id = like_data.video_id
             if not video_url or not video_id:
                 continue
             if video_id in skip_video_ids:
@@ -667,22 +953,32 @@ class InstaCrawler:
         return heavy_map
 
     def _collect_reel_heavy_data_map_by_url(
-        self, light_like_datas: List[Dict], fetch_comments: bool = True, comment_limit: int = 20,
+        self, light_like_datas: List[ReelLightData], fetch_comments: bool = True, comment_limit: int = 20,
         skip_video_ids: Optional[Set[str]] = None
-    ) -> Dict[str, Dict[str, Optional[str]]]:
+    ) -> Dict[str, ReelHeavyData]:
         """フォールバック用: URL遷移方式で詳細データを収集する（旧実装）"""
-        heavy_map: Dict[str, Dict[str, Optional[str]]] = {}
+        heavy_map: Dict[str, ReelHeavyData] = {}
         skip_video_ids = skip_video_ids or set()
+        if self.heavy_tabs > 1:
+            is_skipped = skip_video_ids.__contains__
+            targets = [
+                (video_id, video_url)
+                for like_data in light_like_datas
+                if (video_url := like_data.video_url)
+                and (video_id := like_data.video_id)
+                and not is_skipped(video_id)
+            ]
+            return self._collect_reel_heavy_data_map_in_tabs(targets, fetch_comments, comment_limit)
         for like_data in light_like_datas:
-            video_url = like_data.get("video_url")
-            video_id = like_data.get("video_id")
+            video_url = like_data.video_url
+            video_id = like_data.video_id
             if not video_url or not video_id:
                 continue
             if video_id in skip_video_ids:
                 continue
             try:
-                self.driver.get(video_url)
-                self._random_sleep(2.0, 3.5)
+                if self._goto(video_url):
+                    self._wait_ready()
                 heavy_data = self.get_video_heavy_data_from_video_page(
                     fetch_comments=fetch_comments, comment_limit=comment_limit
                 )
@@ -694,83 +990,97 @@ class InstaCrawler:
                 continue
         return heavy_map
 
+    def _ensure_heavy_tabs(self) -> List[str]:
+        """詳細取得用のタブを heavy_tabs 個まで開いてハンドルを返す"""
+        handles = self.driver.window_handles
+        while len(handles) < self.heavy_tabs:
+            self.driver.execute_script("window.open('about:blank');")
+            handles = self.driver.window_handles
+        self._tab_handles = handles[: self.heavy_tabs]
+        return self._tab_handles
+
+    def _collect_reel_heavy_data_map_in_tabs(
+        self, targets: List[Tuple[str, str]], fetch_comments: bool = True, comment_limit: int = 20
+    ) -> Dict[str, ReelHeavyData]:
+        """
+        複数タブでURL遷移方式の詳細データ収集を行う。
+        WebDriver のセッションは1本なのでコマンドは直列だが、先に全タブで遷移だけ開始しておき、
+        ページの読み込み待ちをタブ間で重ねる。
+        """
+        heavy_map: Dict[str, ReelHeavyData] = {}
+        handles = self._ensure_heavy_tabs()
+        original_handle = self.driver.current_window_handle
+        try:
+            for start in range(0, len(targets), len(handles)):
+                batch = list(zip(handles, targets[start:start + len(handles)]))
+                for handle, (_, video_url) in batch:
+                    self.driver.switch_to.window(handle)
+                    # driver.get は読み込み完了まで戻らないため、JS で遷移だけ開始する
+                    self.driver.execute_script("window.location.href = arguments[0];", video_url)
+                for handle, (video_id, video_url) in batch:
+                    try:
+                        self.driver.switch_to.window(handle)
+                        # 前回のリールが残っているタブで読み取らないよう、URLの切り替わりを待つ
+                        WebDriverWait(self.driver, 15).until(lambda d: video_id in d.current_url)
+                        self._wait_ready()
+                        heavy_map[video_id] = self.get_video_heavy_data_from_video_page(
+                            fetch_comments=fetch_comments, comment_limit=comment_limit
+                        )
+                    except KeyboardInterrupt:
+                        raise
+                    except Exception:
+                        logger.warning(f"動画ページ遷移または詳細取得で失敗: {video_url}", exc_info=True)
+        finally:
+            self.driver.switch_to.window(original_handle)
+        return heavy_map
+
     def _extract_like_count_from_label(self, text: str) -> Optional[str]:
-        patterns = [
-            r"いいね！\s*([\d.,万億]+)",
-            r"([\d.,万億]+)\s*件のいいね",
-            r"([\d.,万億]+)\s*件の「?いいね",
-        ]
-        for pattern in patterns:
-            m = re.search(pattern, text)
-            if m:
-                return m.group(1)
-        return None
+        m = _RE_LIKE_COUNT.search(text)
+        if not m:
+            return None
+        return m.group(1) or m.group(2)
 
     def get_video_like_dates_from_user_page(
         self, user_username: str, max_videos: int = 100
-    ) -> List[Dict[str, str]]:
+    ) -> List[ReelLightData]:
         logger.debug("リールのメタデータを取得します")
-        video_stats: List[Dict[str, str]] = []
+        video_stats: List[ReelLightData] = []
 
         self.navigate_to_reels_page(user_username)
         self._random_sleep(5.0, 7.0)
 
         self.scroll_reels_page(max_videos)
-        post_elements = self.driver.find_elements(By.CSS_SELECTOR, self.REEL_ITEM_CONTAINER_SELECTOR)
-
-        for post_element in post_elements[:max_videos]:
-            try:
-                view_count_text = ""
-                try:
-                    view_elem = post_element.find_element(
-                        By.CSS_SELECTOR, self.REEL_VIEW_COUNT_SELECTOR
-                    )
-                    view_count_text = (view_elem.text or "").strip()
-                except NoSuchElementException:
-                    pass
-
-                link_elem = post_element.find_element(By.CSS_SELECTOR, "a[href*='/reel/']")
-                video_url = link_elem.get_attribute("href") or ""
-                if video_url.startswith("/"):
-                    video_url = f"{self.BASE_URL}{video_url}"
-                video_id, _ = parse_insta_video_url(video_url)
-
-                thumbnail_url = ""
-                try:
-                    thumb_elem = post_element.find_element(
-                        By.CSS_SELECTOR, self.REEL_THUMBNAIL_SELECTOR
-                    )
-                    style_attr = thumb_elem.get_attribute("style") or ""
-                    m = re.search(r'url\("?([^")]+)"?\)', style_attr)
-                    if m:
-                        thumbnail_url = m.group(1)
-                except NoSuchElementException:
-                    pass
-
-                is_pinned = False
-                try:
-                    pinned_icons = post_element.find_elements(
-                        By.CSS_SELECTOR, self.PINNED_SVG_SELECTOR
-                    )
-                    is_pinned = len(pinned_icons) > 0
-                except Exception:
-                    pass
-
-                video_stats.append(
-                    {
-                        "video_url": video_url,
-                        "video_id": video_id,
-                        "user_username": user_username,
-                        "video_thumbnail_url": thumbnail_url,
-                    "like_count_text": None,
-                    "play_count_text": view_count_text,
-                    "crawling_algorithm": "instagram-reels-grid-v1",
-                    "is_pinned": is_pinned,
-                    }
-                )
-            except NoSuchElementException:
-                logger.warning("リールのメタデータ取得で要素不足が発生しました", exc_info=True)
+        # 要素ごとの find_element / get_attribute は都度 chromedriver との往復になるため、
+        # ページ内の JS で全件分をまとめて取り出す
+        reel_items = self.driver.execute_script(
+            self.REEL_GRID_EXTRACT_JS,
+            self.REEL_ITEM_CONTAINER_SELECTOR,
+            self.REEL_VIEW_COUNT_SELECTOR,
+            self.REEL_THUMBNAIL_SELECTOR,
+            self.PINNED_SVG_SELECTOR,
+            max_videos,
+        ) or []
+
+        for item in reel_items:
+            video_url = item.get("href") or ""
+            if not video_url:
+                logger.warning("リールのメタデータ取得で要素不足が発生しました: リンクが見つかりません")
                 continue
+            if video_url.startswith("/"):
+                video_url = f"{self.BASE_URL}{video_url}"
+            video_id, _ = parse_insta_video_url(video_url)
+
+            video_stats.append(
+                ReelLightData(
+                    video_url=video_url,
+                    video_id=video_id,
+                    user_username=user_username,
+                    video_thumbnail_url=item.get("thumbnail") or "",
+                    play_count_text=(item.get("view") or "").strip(),
+                    crawling_algorithm="instagram-reels-grid-v1",
+                    is_pinned=bool(item.get("pinned")),
+                )
+            )
 
         logger.debug(f"リールデータ取得件数: {len(video_stats)} 件")
         return video_stats
@@ -779,130 +1089,146 @@ class InstaCrawler:
         logger.debug("ユーザーの表示名を取得して保存します")
         user_nickname = user_username
         try:
-            # 新UIのニックネーム要素を優先
-            name_elem = self.wait.until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, self.USER_NICKNAME_SELECTOR))
+            # 新UI・旧UIの両方のセレクタを1回の待機で同時に確認する（順に待つとタイムアウトが2回分かかる）
+            user_nickname = self.wait.until(
+                lambda driver: driver.execute_script(
+                    self.NICKNAME_EXTRACT_JS,
+                    self.USER_NICKNAME_SELECTOR,
+                    self.LEGACY_NICKNAME_SELECTOR,
+                )
             )
-            candidate = (name_elem.text or "").strip()
-            if candidate:
-                user_nickname = candidate
         except TimeoutException:
-            logger.debug("新UIのニックネーム要素が見つかりませんでした")
+            logger.warning("表示名の取得に失敗したため、ユーザーネームを代用します")
         except Exception:
             logger.debug("ニックネーム要素取得で予期せぬ例外が発生しました", exc_info=True)
 
-        if user_nickname == user_username:
-            try:
-                # 旧UIのヘッダー要素をフォールバック
-                name_elem = self.wait.until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "header h1, header h2"))
-                )
-                candidate = (name_elem.text or "").strip()
-                if candidate:
-                    user_nickname = candidate
-            except TimeoutException:
-                logger.warning("表示名の取得に失敗したため、ユーザーネームを代用します")
-            except Exception:
-                logger.debug("ヘッダーからのニックネーム取得で例外", exc_info=True)
-
         self.favorite_user_repo.save_favorite_user_nickname(user_username, user_nickname)
         return user_nickname
 
+    @staticmethod
+    def _light_row_tuple(like_data: ReelLightData, crawled_at: datetime) -> tuple:
+        """InstaVideoRepository.save_insta_light_rows の列順に並べた1行分のタプル"""
+        return (
+            like_data.video_url,
+            like_data.video_id,
+            like_data.user_username,
+            like_data.video_thumbnail_url,
+            like_data.play_count_text,
+            parse_insta_number(like_data.play_count_text),
+            like_data.crawling_algorithm,
+            crawled_at,
+        )
+
     def parse_and_save_video_light_datas(
         self,
-        light_like_datas: List[Dict],
+        light_like_datas: List[ReelLightData],
         user_nickname: Optional[str] = None,
         save_light: bool = True,
         publish: bool = True,
+        crawled_at: Optional[datetime] = None,
     ):
         logger.debug("ライトデータをパースして保存します")
-        for like_data in light_like_datas:
-            video_title_text = like_data.get("video_title") or ""
-            audio_title = like_data.get("audio_title") or like_data.get("audio_info_text")
-            play_count_text = like_data.get("play_count_text")
-            play_count = parse_insta_number(play_count_text)
-            crawled_at = datetime.now()
-
-            light_data = InstaLightRawData(
-                id=None,
-                video_url=like_data["video_url"],
-                video_id=like_data["video_id"],
-                user_username=like_data["user_username"],
-                video_thumbnail_url=like_data["video_thumbnail_url"],
-                play_count_text=play_count_text,
-                play_count=play_count,
-                crawling_algorithm=like_data["crawling_algorithm"],
-                crawled_at=crawled_at,
+        # 同じ一覧から取得したデータなので、取得時刻はバッチで1つにする（呼び出し元から渡されればそれを使う）
+        crawled_at = crawled_at or datetime.now()
+
+        # 1件ずつ INSERT すると往復とコミットが件数分発生するため、まとめて保存してから送信する。
+        # 保存用の行はデータクラスを作らず、INSERT の列順のタプルのリストを直接渡す
+        if save_light and light_like_datas:
+            light_row = self._light_row_tuple
+            self.video_repo.save_insta_light_rows(
+                [light_row(like_data, crawled_at) for like_data in light_like_datas]
             )
-            if save_light:
-                self.video_repo.save_insta_light_data(light_data)
 
-            if publish:
-                message_data = {
-                    "video_id": light_data.video_id,
-                    "video_url": light_data.video_url,
-                    "user_username": light_data.user_username,
+        if publish:
+            parse_number = parse_insta_number
+            self._publish_video_master_bulk([
+                {
+                    "video_id": like_data.video_id,
+                    "video_url": like_data.video_url,
+                    "user_username": like_data.user_username,
                     "user_nickname": user_nickname,
-                    "video_thumbnail_url": light_data.video_thumbnail_url,
-                    "video_title": video_title_text,
+                    "video_thumbnail_url": like_data.video_thumbnail_url,
+                    "video_title": like_data.video_title or "",
                     "like_count": None,
-                    "play_count": play_count,
-                    "audio_info_text": like_data.get("audio_info_text"),
-                    "audio_title": audio_title,
-                    "post_time_text": like_data.get("post_time_text"),
-                    "post_time_iso": like_data.get("post_time_iso"),
-                    "comments_json": like_data.get("comments_json"),
+                    "play_count": parse_number(like_data.play_count_text),
+                    "audio_info_text": like_data.audio_info_text,
+                    "audio_title": like_data.audio_title or like_data.audio_info_text,
+                    "post_time_text": like_data.post_time_text,
+                    "post_time_iso": like_data.post_time_iso,
+                    "comments_json": like_data.comments_json,
                 }
-                self._publish_video_master_sync(message_data)
+                for like_data in light_like_datas
+            ])
 
         if save_light:
             logger.info(f"ライトデータを保存しました: {len(light_like_datas)} 件")
 
     def parse_and_save_video_heavy_datas(
         self,
-        light_like_datas: List[Dict],
+        light_like_datas: List[ReelLightData],
         user_nickname: Optional[str] = None,
         save_heavy: bool = True,
         publish: bool = True,
+        crawled_at: Optional[datetime] = None,
+        heavy_data_map: Optional[Dict[str, ReelHeavyData]] = None,
     ):
         logger.debug("ヘビーデータをパースして保存します")
+        heavy_rows: List[InstaHeavyRawData] = []
+        messages: List[Dict] = []
+        crawled_at = crawled_at or datetime.now()
+        parse_number = parse_insta_number
+        parse_date = self._parse_datetime_attr
+        add_row = heavy_rows.append
+        add_message = messages.append
+        get_heavy = heavy_data_map.get if heavy_data_map else None
         for like_data in light_like_datas:
-            video_title_text = like_data.get("video_title") or ""
-            post_time_iso = like_data.get("post_time_iso")
-            post_time_value = self._parse_datetime_attr(post_time_iso)
-            audio_title = like_data.get("audio_title") or like_data.get("audio_info_text")
-            play_count_text = like_data.get("play_count_text")
-            play_count = parse_insta_number(play_count_text)
-
-            heavy_data = InstaHeavyRawData(
-                id=None,
-                video_url=like_data["video_url"],
-                video_id=like_data["video_id"],
-                video_title=video_title_text,
-                post_time_text=like_data.get("post_time_text") or "",
-                post_time=post_time_value,
-                crawling_algorithm=like_data["crawling_algorithm"],
-                crawled_at=datetime.now(),
-                comments_json=like_data.get("comments_json"),
-                audio_title=audio_title,
-            )
+            # 詳細ページから取得した値があれば、別ループを回さずこの走査の中で反映する
+            if get_heavy is not None:
+                heavy = get_heavy(like_data.video_id)
+                if heavy:
+                    like_data.video_title = heavy.video_title
+                    like_data.audio_info_text = heavy.audio_info_text
+                    like_data.audio_title = heavy.audio_info_text
+                    like_data.post_time_text = heavy.post_time_text
+                    like_data.post_time_iso = heavy.post_time_iso
+                    like_data.comments_json = heavy.comments_json
+
+            video_title_text = like_data.video_title or ""
+            post_time_iso = like_data.post_time_iso
+            audio_title = like_data.audio_title or like_data.audio_info_text
+
+            # 投稿日のパースは保存時だけ、再生数のパースは送信時だけ必要なので、使う側でのみ行う
             if save_heavy:
-                self.video_repo.save_insta_heavy_data(heavy_data)
+                add_row(InstaHeavyRawData(
+                    id=None,
+                    video_url=like_data.video_url,
+                    video_id=like_data.video_id,
+                    video_title=video_title_text,
+                    post_time_text=like_data.post_time_text or "",
+                    post_time=parse_date(post_time_iso),
+                    crawling_algorithm=like_data.crawling_algorithm,
+                    crawled_at=crawled_at,
+                    comments_json=like_data.comments_json,
+                    audio_title=audio_title,
+                ))
 
             if publish:
-                message_data = {
-                    "video_id": heavy_data.video_id,
-                    "url": heavy_data.video_url,
-                    "username": like_data.get("user_username"),
+                add_message({
+                    "video_id": like_data.video_id,
+                    "url": like_data.video_url,
+                    "username": like_data.user_username,
                     "nickname": user_nickname,
-                    "play_count": play_count,
-                    "thumbnail_url": like_data.get("video_thumbnail_url"),
+                    "play_count": parse_number(like_data.play_count_text),
+                    "thumbnail_url": like_data.video_thumbnail_url,
                     "video_title": video_title_text,
                     "post_time": post_time_iso,
                     "audio_title": audio_title,
-                    "comments_json": like_data.get("comments_json"),
-                }
-                self._publish_video_master_sync(message_data)
+                    "comments_json": like_data.comments_json,
+                })
+
+        if save_heavy:
+            self.video_repo.save_insta_heavy_data_bulk(heavy_rows)
+        self._publish_video_master_bulk(messages)
 
         if save_heavy:
             logger.info(f"ヘビーデータを保存しました: {len(light_like_datas)} 件")
@@ -911,11 +1237,11 @@ class InstaCrawler:
         logger.debug("フォロワー数を取得します")
         try:
             elem = self.wait.until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "a[href$='/followers/'] span"))
+                EC.presence_of_element_located(self.FOLLOWERS_COUNT_LOCATOR)
             )
             raw_text = (elem.get_attribute("title") or elem.text or "").strip()
             # "フォロワー〇〇人" のような装飾を除去して数値化
-            cleaned_text = re.sub(r"[フォロワー人,\\s]", "", raw_text)
+            cleaned_text = _RE_FOLLOWER_CLEAN.sub("", raw_text)
             return raw_text, parse_insta_number(cleaned_text)
         except TimeoutException:
             logger.warning("フォロワー数の取得に失敗しました", exc_info=True)
@@ -924,9 +1250,15 @@ class InstaCrawler:
         return None, None
 
     def crawl_user(
-        self, user: FavoriteUser, max_videos_per_user: int = 100, mode: str = "both"
+        self,
+        user: FavoriteUser,
+        max_videos_per_user: int = 100,
+        mode: str = "both",
+        crawled_at: Optional[datetime] = None,
     ):
         logger.info(f"ユーザー @{user.favorite_user_username} のライトデータクロールを開始します")
+        # フォロワー履歴の集計日・各行の crawled_at は、ユーザー単位で同じ時刻を使う
+        now = crawled_at or datetime.now()
         try:
             self.navigate_to_user_page(user.favorite_user_username)
         except self.InstaUserNotFoundException:
@@ -936,7 +1268,7 @@ class InstaCrawler:
 
         followers_text, followers_count = self.get_user_followers_count_from_user_page()
         if followers_text is not None or followers_count is not None:
-            collection_date = (datetime.now() - timedelta(days=1)).date()
+            collection_date = (now - timedelta(days=1)).date()
             try:
                 self.favorite_user_repo.upsert_account_follower_history(
                     account_id=user.id,
@@ -956,72 +1288,73 @@ class InstaCrawler:
                 light_like_datas,
                 user_nickname=user_nickname,
                 publish=True,
-            )
-            self.favorite_user_repo.update_favorite_user_last_crawled(
-                user.favorite_user_username, datetime.now()
+                crawled_at=now,
             )
             logger.info(f"ユーザー @{user.favorite_user_username} のクロールが完了しました")
             return True
 
-        if mode == "both":
-            self.parse_and_save_video_light_datas(
-                light_like_datas,
-                user_nickname=user_nickname,
-                publish=False,
-            )
+        # タイトル取得済みのものを除外しつつ、詳細取得の候補も同じ走査で集める
         skip_video_ids: Set[str] = set()
-        missing_title_ids: List[str] = []
+        heavy_candidates: List[ReelLightData] = []
         for like_data in light_like_datas:
-            video_id = like_data.get("video_id")
+            video_id = like_data.video_id
             if not video_id:
                 continue
-            if (like_data.get("video_title") or "").strip():
+            if (like_data.video_title or "").strip():
                 skip_video_ids.add(video_id)
             else:
-                missing_title_ids.append(video_id)
+                heavy_candidates.append(like_data)
 
-        if missing_title_ids:
-            existing_ids = self.video_repo.get_insta_video_ids_with_title(missing_title_ids)
+        heavy_like_datas: List[ReelLightData] = []
+        if heavy_candidates:
+            existing_ids = self.video_repo.get_insta_video_ids_with_title(
+                [like_data.video_id for like_data in heavy_candidates]
+            )
             skip_video_ids.update(existing_ids)
+            is_skipped = skip_video_ids.__contains__
+            heavy_like_datas = [
+                like_data for like_data in heavy_candidates if not is_skipped(like_data.video_id)
+            ]
 
-        heavy_like_datas = [
-            like_data
-            for like_data in light_like_datas
-            if like_data.get("video_id") and like_data["video_id"] not in skip_video_ids
-        ]
-
-        if heavy_like_datas:
-            # user_username引数を追加
-            heavy_data_map = self.collect_reel_heavy_data_map(
+        light_save_future: Optional[Future] = None
+        if mode == "both":
+            # ライトデータの保存は DB だけを使うので、Selenium での詳細取得と並行して行う。
+            # DB 接続は1本のため、保存が終わるまでメインスレッドからは DB に触れない
+            if self._db_executor is None:
+                self._db_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="insta-db")
+            light_save_future = self._db_executor.submit(
+                self.parse_and_save_video_light_datas,
                 light_like_datas,
-                user_username=user.favorite_user_username,
-                fetch_comments=True,
-                skip_video_ids=skip_video_ids,
+                user_nickname=user_nickname,
+                publish=False,
+                crawled_at=now,
             )
-            for like_data in heavy_like_datas:
-                heavy = heavy_data_map.get(like_data["video_id"])
-                if heavy:
-                    like_data.update(
-                        {
-                            "video_title": heavy.get("video_title"),
-                            "audio_info_text": heavy.get("audio_info_text"),
-                            "audio_title": heavy.get("audio_info_text"),
-                            "post_time_text": heavy.get("post_time_text"),
-                            "post_time_iso": heavy.get("post_time_iso"),
-                            "comments_json": heavy.get("comments_json"),
-                        }
-                    )
+
+        try:
+            heavy_data_map: Dict[str, ReelHeavyData] = {}
+            if heavy_like_datas:
+                # user_username引数を追加
+                heavy_data_map = self.collect_reel_heavy_data_map(
+                    light_like_datas,
+                    user_username=user.favorite_user_username,
+                    fetch_comments=True,
+                    skip_video_ids=skip_video_ids,
+                )
+        finally:
+            if light_save_future is not None:
+                light_save_future.result()
+
+        if heavy_like_datas:
             self.parse_and_save_video_heavy_datas(
                 heavy_like_datas,
                 user_nickname=user_nickname,
                 publish=False,
+                crawled_at=now,
+                heavy_data_map=heavy_data_map,
             )
         else:
             logger.info("video_titleが既に保存済みのため、heavyデータ取得をスキップします")
 
-        self.favorite_user_repo.update_favorite_user_last_crawled(
-            user.favorite_user_username, datetime.now()
-        )
         logger.info(f"ユーザー @{user.favorite_user_username} のクロールが完了しました")
         return True
 
@@ -1047,23 +1380,55 @@ class InstaCrawler:
             logger.info("クロール対象ユーザーが存在しません")
             return 0, False
         processed = 0
-        for user in favorite_users:
-            try:
-                self.crawl_user(user, max_videos_per_user=max_videos_per_user, mode=mode)
-            except KeyboardInterrupt:
-                raise
-            except Exception:
-                logger.exception(
-                    f"ユーザー @{user.favorite_user_username} のクロール中にエラーが発生しました"
-                )
-            finally:
-                processed += 1
-            if run_deadline is not None and time.monotonic() >= run_deadline:
-                logger.info("稼働時間の上限に達したため、このユーザーまでで停止します")
-                return processed, True
+        # クロールが完了したユーザーの最終クロール時刻は、1人ずつではなくまとめて更新する
+        last_crawled: List[Tuple[str, datetime]] = []
+        try:
+            for user in favorite_users:
+                try:
+                    now = datetime.now()
+                    if self.crawl_user(
+                        user, max_videos_per_user=max_videos_per_user, mode=mode, crawled_at=now
+                    ):
+                        last_crawled.append((user.favorite_user_username, now))
+                except KeyboardInterrupt:
+                    raise
+                except self.InstaRateLimitedException:
+                    # 同じIPで続けても制限が続くだけなので、プロキシを切り替えて次のユーザーへ進む
+                    logger.warning(
+                        f"ユーザー @{user.favorite_user_username} でアクセス制限を検知しました"
+                    )
+                    try:
+                        if not self.rotate_proxy():
+                            logger.warning("プロキシを切り替えられないため、このままクロールを続けます")
+                    except Exception:
+                        # 再起動・再ログインの失敗でユーザーのループごと止めず、次のユーザーへ進む
+                        logger.exception("プロキシの切り替えに失敗しました。次のユーザーへ進みます")
+                except Exception:
+                    logger.exception(
+                        f"ユーザー @{user.favorite_user_username} のクロール中にエラーが発生しました"
+                    )
+                finally:
+                    processed += 1
+                if len(last_crawled) >= LAST_CRAWLED_FLUSH_SIZE:
+                    self._flush_last_crawled(last_crawled)
+                if run_deadline is not None and time.monotonic() >= run_deadline:
+                    logger.info("稼働時間の上限に達したため、このユーザーまでで停止します")
+                    return processed, True
+        finally:
+            self._flush_last_crawled(last_crawled)
         logger.info(f"{len(favorite_users)}件のユーザーに対するクロールが完了しました")
         return processed, False
 
+    def _flush_last_crawled(self, last_crawled: List[Tuple[str, datetime]]):
+        if not last_crawled:
+            return
+        try:
+            self.favorite_user_repo.update_favorite_users_last_crawled(last_crawled)
+        except Exception:
+            logger.exception("最終クロール時刻の更新に失敗しました")
+        finally:
+            last_crawled.clear()
+
 
 def main():
     import argparse
@@ -1122,6 +1487,25 @@ def main():
         action="store_true",
         help="プロキシを使わず直接接続する",
     )
+    parser.add_argument(
+        "--proxies",
+        help="アクセス制限時に順番に切り替える予備のプロキシ（カンマ区切り）",
+    )
+    parser.add_argument(
+        "--attach-to",
+        help="起動済みのChromeのデバッガーアドレス（例: 127.0.0.1:9222）。指定時はChromeを起動せず接続する",
+    )
+    parser.add_argument(
+        "--heavy-tabs",
+        type=int,
+        default=1,
+        help="詳細データ取得に使うタブ数。2以上でURL遷移方式の先読みを行う（デフォルト: 1）",
+    )
+    parser.add_argument(
+        "--block-media",
+        action="store_true",
+        help="ログイン後は画像・動画・音声を読み込まずにクロールする",
+    )
     args = parser.parse_args()
 
     mode = args.mode
@@ -1175,19 +1559,24 @@ def main():
                 logger.info("クロール対象ユーザーが存在しません")
                 return
             start_index = 0
-            while start_index < len(favorite_users):
-                with InstaCrawler(
-                    crawler_account_repo=crawler_account_repo,
-                    favorite_user_repo=favorite_user_repo,
-                    video_repo=video_repo,
-                    crawler_account_id=crawler_account_id,
-                    sadcaptcha_api_key=os.getenv("SADCAPTCHA_API_KEY"),
-                    device_type=args.device_type,
-                    use_profile=args.use_profile,
-                    chrome_user_data_dir=args.chrome_user_data_dir,
-                    chrome_profile_directory=args.chrome_profile_directory,
-                    use_proxy=not args.no_proxy,
-                ) as crawler:
+            # Chrome の起動とログインは数秒〜十数秒かかるため、休憩をまたいで同じセッションを使い続ける
+            with InstaCrawler(
+                crawler_account_repo=crawler_account_repo,
+                favorite_user_repo=favorite_user_repo,
+                video_repo=video_repo,
+                crawler_account_id=crawler_account_id,
+                sadcaptcha_api_key=os.getenv("SADCAPTCHA_API_KEY"),
+                device_type=args.device_type,
+                use_profile=args.use_profile,
+                chrome_user_data_dir=args.chrome_user_data_dir,
+                chrome_profile_directory=args.chrome_profile_directory,
+                use_proxy=not args.no_proxy,
+                heavy_tabs=args.heavy_tabs,
+                block_media=args.block_media,
+                proxies=[p.strip() for p in (args.proxies or "").split(",") if p.strip()],
+                attach_to=args.attach_to,
+            ) as crawler:
+                while start_index < len(favorite_users):
                     run_deadline = time.monotonic() + run_seconds
                     processed, _ = crawler.crawl_favorite_users(
                         max_videos_per_user=args.max_videos_per_user,
@@ -1197,10 +1586,11 @@ def main():
                         favorite_users=favorite_users,
                         start_index=start_index,
                     )
-                start_index += processed
-                if start_index < len(favorite_users):
-                    logger.info(f"{REST_MINUTES}分休憩します")
-                    time.sleep(rest_seconds)
+                    start_index += processed
+                    if start_index < len(favorite_users):
+                        logger.info(f"{REST_MINUTES}分休憩します")
+                        time.sleep(rest_seconds)
+                        crawler.ensure_session()
 
 
 if __name__ == "__main__":
@@ -1,29 +1,103 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from selenium_stealth import stealth
 import undetected_chromedriver as uc
 from tiktok_captcha_solver import SeleniumSolver  # CAPTCHAソルバー用
 from tiktok_captcha_solver.captchatype import CaptchaType
-from selenium.webdriver.common.by import By
-from selenium.common.exceptions import (
-    NoSuchElementException,
-    ElementClickInterceptedException,
-)
-from concurrent.futures import ThreadPoolExecutor
-from typing import Optional
+from selenium import webdriver
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from typing import List, Optional
 from ..logger import setup_logger
 import tempfile, shutil, os, time, logging, subprocess, ssl
+import atexit, threading, weakref
+
+try:
+    import psutil
+except ImportError:  # psutil は任意。無い場合は netstat / tasklist / PowerShell で調べる
+    psutil = None
 
 logger = setup_logger(__name__)
 
+# 起動ごとに変わらない Chrome の起動フラグ
+_STATIC_FLAGS = (
+    '--no-sandbox',
+    '--mute-audio',
+    '--use-angle=gl',
+    '--enable-features=Vulkan,VaapiVideoDecoder',
+    '--disable-vulkan-surface',
+    '--enable-gpu-rasterization',
+    '--enable-zero-copy',
+    '--ignore-gpu-blocklist',
+    '--enable-hardware-overlays',
+
+    # PC用の追加フラグ
+    # JS タイマー／Renderer を背景でも止めない
+    '--disable-background-timer-throttling',
+    '--disable-renderer-backgrounding',
+    '--disable-backgrounding-occluded-windows',
+
+    # 自動タブ破棄（メモリ不足時にプロセス kill）の無効化
+    '--disable-tab-discarding',
+
+    # バッテリーセーバーや Energy Saver モードを無効化
+    '--battery-saver-mode=disable',
+
+    # オートプレイ規制を緩和（音付きでもユーザー操作不要）
+    '--autoplay-policy=no-user-gesture-required',
+
+    # Chromium "features" として実装された追加抑制を止める
+    '--disable-features='
+    'CalculateBackgroundVideoPlaybackMinFrameRate,'
+    'PauseBackgroundTabsMediaToggle,'
+    'IntensiveWakeUpThrottling',
+
+    # 以下のオプションを追加することを推奨
+    '--disable-blink-features=AutomationControlled',
+)
+
+# プロファイルの複製時に持ち込まない、起動中の Chrome が作るロックやログ
+_PROFILE_TEMPLATE_IGNORE = shutil.ignore_patterns(
+    "Singleton*", "lockfile", "LOCK", "*.log", "Crashpad",
+)
+
+# CAPTCHA の種類ごとに呼び出す SeleniumSolver のメソッド名
+_SOLVER_METHODS = {
+    CaptchaType.ROTATE_V2: "solve_rotate_v2",
+    CaptchaType.SHAPES_V1: "solve_shapes",
+    CaptchaType.SHAPES_V2: "solve_shapes_v2",
+    CaptchaType.ROTATE_V1: "solve_rotate",
+    CaptchaType.ICON_V1: "solve_icon",
+    CaptchaType.ICON_V2: "solve_icon_v2",
+    CaptchaType.PUZZLE_V2: "solve_puzzle_v2",
+    CaptchaType.PUZZLE_V1: "solve_puzzle",
+}
+
 class SeleniumManager:
-    def __init__(self, proxy: str = None, sadcaptcha_api_key: str = None, device_type: str = "pc", use_profile: bool = False, user_data_dir: Optional[str] = None, profile_directory: Optional[str] = None):
+    # 一時プロファイルを削除中のスレッド（終了時に join する）
+    _cleanup_threads: "weakref.WeakSet[threading.Thread]" = weakref.WeakSet()
+    CLEANUP_JOIN_TIMEOUT_SEC = 10.0
+
+    # デバイスタイプごとのウィンドウサイズ（起動時の --window-size で指定し、起動後のリサイズを省く）
+    WINDOW_SIZES = {
+        "pc": (1920, 1080),
+        "vps": (1024, 576),
+    }
+
+    # 全ページに注入されるため webdriver だけを上書きする
+    # （plugins を空にしたり window.chrome を消すと stealth の偽装を打ち消し、逆に検出されやすくなる）
+    ANTI_DETECTION_JS = """
+    Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
+    """
+
+    def __init__(self, proxy: str = None, sadcaptcha_api_key: str = None, device_type: str = "pc", use_profile: bool = False, user_data_dir: Optional[str] = None, profile_directory: Optional[str] = None, proxies: Optional[List[str]] = None, attach_to: Optional[str] = None, chrome_verbose_log: Optional[bool] = None, profile_template_dir: Optional[str] = None):
         self.driver = None
         self.solver = None
-        self.proxy = proxy
+        # proxies を渡した場合は先頭から使い、rotate_proxy() で順番に次のプロキシへ切り替える
+        self.proxies: List[str] = [p for p in (proxies or [proxy]) if p]
+        self._proxy_index = 0
+        self.proxy = self.proxies[0] if self.proxies else None
         self.sadcaptcha_api_key = sadcaptcha_api_key
         self.device_type = device_type
+        # ログの接頭辞（デバイスタイプは変わらないので最初に1回だけ決める）
+        self._device_str = "モバイル用" if device_type == "mobile" else ""
         self.use_profile = use_profile
         self.user_data_dir = user_data_dir
         self.profile_directory = profile_directory
@@ -32,92 +106,33 @@ class SeleniumManager:
         self._chrome_debugger_address: Optional[str] = None
         self._chrome_pid: Optional[int] = None
         self._chrome_log_path: Optional[str] = None
+        # solve_* にタイムアウトをかけるためのワーカー。CAPTCHA をまたいで使い回す
+        self._solve_executor: Optional[ThreadPoolExecutor] = None
+        # 直前の check_and_solve_captcha がタイムアウトでドライバーを作り直したか
+        # （新しいドライバーは about:blank でログインもしていないため、呼び出し元が遷移・ログインし直す）
+        self.driver_recreated = False
+        # "host:port" を指定すると、Chrome を起動せず --remote-debugging-port 付きで起動済みの Chrome に接続する
+        self.attach_to = attach_to
+        if attach_to and self.proxies:
+            # プロキシは Chrome の起動引数でしか設定できないため、接続先の Chrome の設定がそのまま使われる
+            logger.warning("%s起動済みのChromeに接続するため、プロキシ設定は無視されます。proxy=%s debugger_address=%s", self._device_str, self.proxy, attach_to)
+        # Chrome の詳細ログ（--v=1）を出すか。未指定なら環境変数 SELENIUM_CHROME_VERBOSE=1 で有効にする
+        if chrome_verbose_log is None:
+            chrome_verbose_log = os.getenv("SELENIUM_CHROME_VERBOSE") == "1"
+        self.chrome_verbose_log = chrome_verbose_log
+        # 一時プロファイルの複製元（一度 Chrome を起動して終了したプロファイル）。未指定なら SELENIUM_PROFILE_TEMPLATE
+        self.profile_template_dir = profile_template_dir or os.getenv("SELENIUM_PROFILE_TEMPLATE")
 
     def setup_driver(self):
         try:
-            device_str = "モバイル用" if self.device_type == "mobile" else ""
-            if self.use_profile:
-                if not self.user_data_dir:
-                    raise ValueError("user_data_dir must be provided when use_profile is True")
-                profile_dir = self.user_data_dir
-                self._temp_profile_dir = None
+            if self.attach_to:
+                self._connect_shared_chrome()
             else:
-                profile_dir = tempfile.mkdtemp(prefix="sel_profile_")
-                self._temp_profile_dir = profile_dir
-            self._active_profile_dir = profile_dir
-            # 既存のオプション設定
-            options = uc.ChromeOptions()
-            if self.proxy:
-                options.add_argument(f'--proxy-server={self.proxy}')
-            
-            # 基本設定
-            options.add_argument(f"--user-data-dir={profile_dir}")
-            if self.use_profile and self.profile_directory:
-                options.add_argument(f"--profile-directory={self.profile_directory}")
-            self._chrome_log_path = os.path.join(profile_dir, "chrome_debug.log")
-            options.add_argument("--enable-logging")
-            options.add_argument("--v=1")
-            options.add_argument(f"--log-file={self._chrome_log_path}")
-            logger.info("Chrome log file configured. path=%s", self._chrome_log_path)
-            options.add_argument('--no-sandbox')
-            options.add_argument('--mute-audio')
-            options.add_argument('--use-angle=gl')
-            options.add_argument('--enable-features=Vulkan,VaapiVideoDecoder')
-            options.add_argument('--disable-vulkan-surface')
-            options.add_argument('--enable-gpu-rasterization')
-            options.add_argument('--enable-zero-copy')
-            options.add_argument('--ignore-gpu-blocklist')
-            options.add_argument('--enable-hardware-overlays')
-            options.add_argument('--start-maximized')
-            
-            # PC用の追加フラグ
-            extra_flags = [
-                # JS タイマー／Renderer を背景でも止めない
-                '--disable-background-timer-throttling',
-                '--disable-renderer-backgrounding',
-                '--disable-backgrounding-occluded-windows',
-
-                # 自動タブ破棄（メモリ不足時にプロセス kill）の無効化
-                '--disable-tab-discarding',
-
-                # バッテリーセーバーや Energy Saver モードを無効化
-                '--battery-saver-mode=disable',
-
-                # オートプレイ規制を緩和（音付きでもユーザー操作不要）
-                '--autoplay-policy=no-user-gesture-required',
-
-                # Chromium "features" として実装された追加抑制を止める
-                '--disable-features='
-                'CalculateBackgroundVideoPlaybackMinFrameRate,'
-                'PauseBackgroundTabsMediaToggle,'
-                'IntensiveWakeUpThrottling'
-            ]
-            for f in extra_flags:
-                options.add_argument(f)
-
-            # 以下のオプションを追加することを推奨
-            options.add_argument("--disable-blink-features=AutomationControlled")
-
-            # SSL証明書エラー回避（undetected_chromedriver がChromeDriverをダウンロードする際に必要）
-            _original_ctx = ssl._create_default_https_context
-            ssl._create_default_https_context = ssl._create_unverified_context
-            try:
-                self.driver = uc.Chrome(options=options)
-            finally:
-                ssl._create_default_https_context = _original_ctx
-            self._cache_chrome_process_info()
-            self._log_chrome_process_snapshot("after_start")
-
-            # ウィンドウサイズ設定
-            if self.device_type == "pc":
-                self.driver.set_window_size(1920, 1080)
-            elif self.device_type == "vps":
-                self.driver.set_window_size(1024, 576)   
+                self._launch_chrome()
 
             if self.sadcaptcha_api_key:
                 # CAPTCHA Solver使用時
-                device_str = "モバイル用" if self.device_type == "mobile" else ""
-                logger.info(f"{device_str}CAPTCHA Solver付きのドライバーを作成します")
+                logger.info("%sCAPTCHA Solver付きのドライバーを作成します", self._device_str)
                 self.solver = SeleniumSolver(
                     self.driver,
                     self.sadcaptcha_api_key  # オプションを渡す
@@ -135,103 +150,215 @@ class SeleniumManager:
             )
             
             # より包括的なウェブドライバー検出回避
-            js_script = """
-            Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
-            Object.defineProperty(navigator, 'plugins', {get: function() { return []; }});
-            Object.defineProperty(navigator, 'languages', {get: function() { return ['ja-JP', 'ja']; }});
-            Object.defineProperty(navigator, 'maxTouchPoints', {get: function() { return 5; }});
-            window.chrome = undefined;
-            """
-            self.driver.execute_script(js_script)
+            # execute_script だと今開いているページにしか効かないため、stealth と同じく
+            # 新しいドキュメントごとに自動で実行されるスクリプトとして1回だけ登録する
+            self.driver.execute_cdp_cmd(
+                "Page.addScriptToEvaluateOnNewDocument", {"source": self.ANTI_DETECTION_JS}
+            )
             
-            logger.info(f"{device_str}Chromeドライバーの設定が完了しました")
+            logger.info("%sChromeドライバーの設定が完了しました", self._device_str)
             return self.driver
         
         except Exception as e:
-            logger.error(f"{device_str}Chromeドライバーの設定中にエラーが発生しました: {e}")
+            logger.error("%sChromeドライバーの設定中にエラーが発生しました: %s", self._device_str, e)
             raise
 
+    def _launch_chrome(self):
+        if self.use_profile:
+            if not self.user_data_dir:
+                raise ValueError("user_data_dir must be provided when use_profile is True")
+            profile_dir = self.user_data_dir
+            self._temp_profile_dir = None
+        else:
+            profile_dir = tempfile.mkdtemp(prefix="sel_profile_")
+            if self.profile_template_dir and os.path.isdir(self.profile_template_dir):
+                # 空のプロファイルだと Chrome が初回起動の初期化を行うため、初期化済みのものを複製して使う
+                shutil.copytree(
+                    self.profile_template_dir,
+                    profile_dir,
+                    dirs_exist_ok=True,
+                    ignore=_PROFILE_TEMPLATE_IGNORE,
+                )
+            self._temp_profile_dir = profile_dir
+        self._active_profile_dir = profile_dir
+        # 既存のオプション設定
+        options = uc.ChromeOptions()
+        if self.proxy:
+            options.add_argument(f'--proxy-server={self.proxy}')
+        
+        # 基本設定
+        options.add_argument(f"--user-data-dir={profile_dir}")
+        if self.use_profile and self.profile_directory:
+            options.add_argument(f"--profile-directory={self.profile_directory}")
+        if self.chrome_verbose_log:
+            # 詳細ログは書き込み量が多いため、調査時だけ有効にする
+            self._chrome_log_path = os.path.join(profile_dir, "chrome_debug.log")
+            options.add_argument("--enable-logging")
+            options.add_argument("--v=1")
+            options.add_argument(f"--log-file={self._chrome_log_path}")
+            logger.info("Chrome log file configured. path=%s", self._chrome_log_path)
+        else:
+            self._chrome_log_path = None
+        for f in _STATIC_FLAGS:
+            options.add_argument(f)
+        window_size = self.WINDOW_SIZES.get(self.device_type)
+        if window_size:
+            options.add_argument(f"--window-size={window_size[0]},{window_size[1]}")
+        else:
+            options.add_argument('--start-maximized')
+
+        # SSL証明書エラー回避（undetected_chromedriver がChromeDriverをダウンロードする際に必要）
+        _original_ctx = ssl._create_default_https_context
+        ssl._create_default_https_context = ssl._create_unverified_context
+        try:
+            self.driver = uc.Chrome(options=options)
+        finally:
+            ssl._create_default_https_context = _original_ctx
+        self._cache_chrome_process_info()
+        self._log_chrome_process_snapshot("after_start")
+
+    def _connect_shared_chrome(self):
+        """起動済みの Chrome に接続する（プロファイル作成・起動オプション・Chrome 起動を省く）"""
+        # undetected_chromedriver は接続先を指定しても自前で Chrome を起動するため、接続には通常の WebDriver を使う
+        options = webdriver.ChromeOptions()
+        options.add_experimental_option("debuggerAddress", self.attach_to)
+        self._temp_profile_dir = None
+        self._active_profile_dir = None
+        self._chrome_debugger_address = self.attach_to
+        self._chrome_pid = None
+        self.driver = webdriver.Chrome(options=options)
+        logger.info("起動済みのChromeに接続しました。debugger_address=%s", self.attach_to)
+
     def check_and_solve_captcha(self):
         """CAPTCHAが存在するかチェックし、存在する場合は解決を試みる"""
         TIMEOUT_PER_ATTEMPT = 10          # solve_* 1 回あたりの制限秒数
-        SLEEP_BETWEEN_ATTEMPTS = 3
+        CLEAR_WAIT_PER_ATTEMPT = 1        # solve_* が失敗を返した後に CAPTCHA が消えるのを待つ最大秒数（0.5s 間隔で確認）
         MAX_ATTEMPTS = 10
+        self.driver_recreated = False
         if not self.solver:
             return False
 
         try:
             present = self.solver.captcha_is_present()
-            logger.debug(f"captcha_present={present}")
+            logger.debug("captcha_present=%s", present)
             if not present:
                 return False 
             
 
             for attempt in range(1,MAX_ATTEMPTS+1):
-                logger.info(f"[{attempt}/{MAX_ATTEMPTS}] CAPTCHA 解決を試行中…")
+                logger.info("[%d/%d] CAPTCHA 解決を試行中…", attempt, MAX_ATTEMPTS)
                 captcha_type = self.solver.identify_captcha()
 
-                def _solve():                
-                    if captcha_type == CaptchaType.ROTATE_V2:
-                        return self.solver.solve_rotate_v2()
-                    elif captcha_type == CaptchaType.SHAPES_V1:
-                        return self.solver.solve_shapes()
-                    elif captcha_type == CaptchaType.SHAPES_V2:
-                        return self.solver.solve_shapes_v2()
-                    elif captcha_type == CaptchaType.ROTATE_V1:
-                        return self.solver.solve_rotate()
-                    elif captcha_type == CaptchaType.ICON_V1:
-                        return self.solver.solve_icon()
-                    elif captcha_type == CaptchaType.ICON_V2:
-                        return self.solver.solve_icon_v2()
-                    elif captcha_type == CaptchaType.PUZZLE_V2:
-                        return self.solver.solve_puzzle_v2()
-                    elif captcha_type == CaptchaType.PUZZLE_V1:
-                        return self.solver.solve_puzzle()
-
-
-                with ThreadPoolExecutor(max_workers=1) as ex:
-                    future = ex.submit(_solve)
-                    try:
-                        ok = future.result(timeout=TIMEOUT_PER_ATTEMPT)
-                    except TimeoutError:
-                        logger.error(f"CAPTCHA解決をリフレッシュします。")
-                        ok = False
-                        try:
-                            refresh_btn = self.driver.find_element(By.ID, "captcha_refresh_button")
-                            refresh_btn.click()
-                            logger.debug("リフレッシュボタンをクリックしました")
-                        except (NoSuchElementException, ElementClickInterceptedException) as e:
-                            logger.debug(f"リフレッシュボタンが押せませんでした: {e}")
-                        continue
-                    except Exception as e:
-                        logger.error(f"CAPTCHA解決中にエラーが発生しました: {e}")
-                        return False
-                    logger.debug(f"solve_{captcha_type}() => {ok}")
-
-                if ok or not self.solver.captcha_is_present(timeout=3):
+                future = self._get_solve_executor().submit(self._solve_captcha, captcha_type)
+                try:
+                    ok = future.result(timeout=TIMEOUT_PER_ATTEMPT)
+                except FuturesTimeoutError:
+                    break
+                except Exception as e:
+                    logger.error("CAPTCHA解決中にエラーが発生しました: %s", e)
+                    return False
+                logger.debug("solve_%s() => %s", captcha_type, ok)
+
+                if ok:
                     logger.info("CAPTCHAの解決が完了しました")
                     return True
-        
-                logger.info(f"CAPTCHA まだ残存。{SLEEP_BETWEEN_ATTEMPTS}s 待って再試行")
-                time.sleep(SLEEP_BETWEEN_ATTEMPTS)   
-            logger.warning("最大試行回数に達しました。CAPTCHA 解決失敗")
-            return False         
+                # 失敗を返しても実際には解けていることがあるため、短く確認してから再試行する
+                if self._wait_for_captcha_clear(CLEAR_WAIT_PER_ATTEMPT):
+                    logger.info("CAPTCHAの解決が完了しました")
+                    return True
+
+                logger.info("CAPTCHA まだ残存。%ds 待っても消えないため再試行", CLEAR_WAIT_PER_ATTEMPT)
+            else:
+                logger.warning("最大試行回数に達しました。CAPTCHA 解決失敗")
+                return False
+        except Exception as e:
+            logger.error("CAPTCHA 解決中に例外が発生: %s", e)
+            return False
+
+        # 止められない solve_* がドライバーを触り続けるため、同じドライバーは使い回さずに作り直す
+        # （self.driver が差し替わるので、呼び出し元は driver_recreated を見て参照を取り直すこと）
+        logger.error("CAPTCHA解決が%d秒でタイムアウトしたため、ドライバーを再作成します", TIMEOUT_PER_ATTEMPT)
+        try:
+            self.quit_driver()
+            self.setup_driver()
         except Exception as e:
-            logger.error(f"CAPTCHA 解決中に例外が発生: %s", e)
+            logger.error("CAPTCHAタイムアウト後のドライバー再作成に失敗しました: %s", e)
             return False
+        self.driver_recreated = True
+        return False
+
+    def _solve_captcha(self, captcha_type: CaptchaType):
+        method_name = _SOLVER_METHODS.get(captcha_type)
+        return getattr(self.solver, method_name)() if method_name else None
+
+    def _get_solve_executor(self) -> ThreadPoolExecutor:
+        if self._solve_executor is None:
+            self._solve_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="captcha")
+        return self._solve_executor
+
+    def _shutdown_solve_executor(self) -> None:
+        if self._solve_executor is not None:
+            # タイムアウトした solve_* の終了は待たずに抜ける
+            self._solve_executor.shutdown(wait=False, cancel_futures=True)
+            self._solve_executor = None
+
+    def _wait_for_captcha_clear(self, timeout: int = 3) -> bool:
+        """CAPTCHAが消えた時点で True を返す。timeout 秒経っても残っていれば False"""
+        # captcha_is_present は「無い」ことの確認に timeout 秒まるごとかかるため、
+        # 消えた時点ですぐ返る captcha_is_not_present でポーリングする
+        return self.solver.captcha_is_not_present(timeout=timeout)
+
+    def rotate_proxy(self):
+        """
+        次のプロキシに切り替えてドライバーを作り直す。
+        use_profile 時は同じプロファイルを使うため、ログイン状態は引き継がれる。
+        切り替え先がない場合は何もせず None を返す。
+        """
+        if self.attach_to:
+            logger.warning("起動済みのChromeに接続しているため、プロキシは切り替えられません")
+            return None
+        if len(self.proxies) < 2:
+            logger.warning("切り替え先のプロキシがないため、プロキシのローテーションをスキップします")
+            return None
+        self._proxy_index = (self._proxy_index + 1) % len(self.proxies)
+        self.proxy = self.proxies[self._proxy_index]
+        logger.info("プロキシを切り替えてドライバーを再作成します (%d/%d)", self._proxy_index + 1, len(self.proxies))
+        self.quit_driver()
+        return self.setup_driver()
 
     def quit_driver(self):
-        if self.driver:
+        self._shutdown_solve_executor()
+        if self.driver and self.attach_to:
+            # 共有 Chrome は他のセッションも使うため、WebDriver のセッションだけ閉じてプロセスは残す
+            self.driver.quit()
+            logger.info("共有Chromeとの接続を終了しました")
+        elif self.driver:
             self._log_chrome_process_snapshot("before_quit")
             self.driver.quit()
             logger.info("Chromeドライバーを終了しました")
             self._log_chrome_process_snapshot("after_quit")
             self._force_kill_orphaned_chrome()
         if self._temp_profile_dir and os.path.isdir(self._temp_profile_dir):
-            shutil.rmtree(self._temp_profile_dir, ignore_errors=True)
+            # プロファイルは小さなファイルが大量にあり削除に時間がかかるため、呼び出し元を待たせない
+            cleanup = threading.Thread(
+                target=shutil.rmtree,
+                args=(self._temp_profile_dir,),
+                kwargs={"ignore_errors": True},
+                name="profile-cleanup",
+                daemon=True,
+            )
+            cleanup.start()
+            self._cleanup_threads.add(cleanup)
             self._temp_profile_dir = None
         self._active_profile_dir = None
 
+    @classmethod
+    def _join_cleanup_threads(cls) -> None:
+        """プロセス終了時に、削除中の一時プロファイルを残さないよう短時間だけ待つ"""
+        deadline = time.monotonic() + cls.CLEANUP_JOIN_TIMEOUT_SEC
+        for thread in list(cls._cleanup_threads):
+            thread.join(max(0.0, deadline - time.monotonic()))
+
     def _cache_chrome_process_info(self) -> None:
         self._chrome_debugger_address = self._get_debugger_address()
         self._chrome_pid = self._pid_from_debugger_address(self._chrome_debugger_address)
@@ -266,6 +393,14 @@ class SeleniumManager:
             port = int(port_str)
         except (ValueError, AttributeError):
             return None
+        if psutil is not None:
+            try:
+                for conn in psutil.net_connections(kind="tcp"):
+                    if conn.laddr and conn.laddr.port == port and conn.status == psutil.CONN_LISTEN:
+                        return conn.pid
+            except (psutil.Error, OSError):
+                return None
+            return None
         try:
             output = subprocess.check_output(
                 "netstat -ano -p tcp",
@@ -288,6 +423,12 @@ class SeleniumManager:
     def _get_process_command_line(self, pid: Optional[int]) -> Optional[str]:
         if os.name != "nt" or not pid:
             return None
+        if psutil is not None:
+            # PID の再利用を見分けるために使うので、キャッシュせず毎回取得する
+            try:
+                return " ".join(psutil.Process(pid).cmdline()) or None
+            except psutil.Error:
+                return None
         try:
             cmd = [
                 "powershell",
@@ -303,6 +444,8 @@ class SeleniumManager:
     def _process_exists(self, pid: Optional[int]) -> Optional[bool]:
         if os.name != "nt" or not pid:
             return None
+        if psutil is not None:
+            return psutil.pid_exists(pid)
         try:
             output = subprocess.check_output(
                 ["tasklist", "/FI", f"PID eq {pid}"],
@@ -316,6 +459,9 @@ class SeleniumManager:
     def _log_chrome_process_snapshot(self, stage: str) -> None:
         if not self._chrome_pid and self.driver:
             self._cache_chrome_process_info()
+        # コマンドラインや生存確認はログにしか使わないため、INFO が出ないときは調べない
+        if not logger.isEnabledFor(logging.INFO):
+            return
         cmdline = self._get_process_command_line(self._chrome_pid)
         exists = self._process_exists(self._chrome_pid)
         logger.info(
@@ -370,3 +516,6 @@ class SeleniumManager:
                 port = None
         has_port = port is not None and f"--remote-debugging-port={port}" in cmdline_lower
         return has_profile or has_port
+
+
+atexit.register(SeleniumManager._join_cleanup_threads)
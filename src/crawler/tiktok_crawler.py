@@ -374,7 +374,18 @@ class TikTokCrawler:
 
     def _check_and_handle_captcha(self):
         """CAPTCHAをチェックして処理する"""
-        if self.selenium_manager.check_and_solve_captcha():
+        solved = self.selenium_manager.check_and_solve_captcha()
+        if self.selenium_manager.driver_recreated:
+            # CAPTCHA解決がタイムアウトすると未ログインの新しいドライバーに差し替わるため、参照を取り直してログインし直す
+            self.driver = self.selenium_manager.driver
+            self.wait = WebDriverWait(self.driver, 15)
+            if self.login_restart_attempted:
+                raise TimeoutException("CAPTCHA解決がタイムアウトしてドライバーを再作成しましたが、再ログインは試行済みです")
+            self.login_restart_attempted = True
+            logger.warning("CAPTCHA解決のタイムアウトでドライバーが再作成されたため、ログインし直します")
+            self._login()
+            return False
+        if solved:
             self._random_sleep(2.0, 4.0)  # CAPTCHA解決後の待機
             return True
         return False
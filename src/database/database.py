@@ -1,6 +1,6 @@
 import mysql.connector
 from mysql.connector import Error
-from typing import Optional
+from typing import Optional, Sequence
 from ..config import DB_CONFIG
 from ..logger import setup_logger
 
@@ -54,3 +54,18 @@ class Database:
             if not query.strip().upper().startswith('SELECT'):
                 self.connection.rollback()
             raise
+
+    def execute_many(self, query: str, params_list: Sequence[tuple]):
+        """同じクエリを複数行分まとめて実行し、1回だけコミットする"""
+        # C拡張のカーソルはリスト・タプル以外を受け付けないため、ジェネレーター等はリストにしてから渡す
+        if not isinstance(params_list, (list, tuple)):
+            params_list = list(params_list)
+        try:
+            cursor = self.get_connection().cursor()
+            cursor.executemany(query, params_list)
+            self.connection.commit()
+            return cursor
+        except Error as e:
+            logger.error(f"一括クエリ実行エラー: {e}")
+            self.connection.rollback()
+            raise
@@ -106,3 +106,31 @@ class InstaHeavyRawData:
     crawled_at: datetime = datetime.now()
     comments_json: Optional[str] = None
     audio_title: Optional[str] = None
+
+# リール一覧から取得した1件分のデータ（詳細取得後は詳細項目もここに書き込む）
+@dataclass(slots=True)
+class ReelLightData:
+    video_url: str
+    video_id: str  # InstagramリールのIDそのまま
+    user_username: str
+    video_thumbnail_url: str = ""
+    play_count_text: Optional[str] = None
+    is_pinned: bool = False
+    like_count_text: Optional[str] = None  # Instagramリールでは未使用
+    crawling_algorithm: str = ""
+    video_title: Optional[str] = None
+    audio_info_text: Optional[str] = None
+    audio_title: Optional[str] = None
+    post_time_text: Optional[str] = None
+    post_time_iso: Optional[str] = None
+    comments_json: Optional[str] = None
+
+# リール詳細ページから取得したデータ
+@dataclass(slots=True)
+class ReelHeavyData:
+    video_url: Optional[str] = None
+    post_time_text: Optional[str] = None
+    post_time_iso: Optional[str] = None
+    audio_info_text: Optional[str] = None
+    video_title: Optional[str] = None
+    comments_json: Optional[str] = None
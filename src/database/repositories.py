@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import List, Optional, Set, Dict, Tuple
+from typing import List, Optional, Sequence, Set, Dict, Tuple
 from .database import Database
 from .models import (
     CrawlerAccount,
@@ -537,6 +537,25 @@ class InstaFavoriteUserRepository:
         """
         self.db.execute_query(query, (last_crawled_at, username))
 
+    def update_favorite_users_last_crawled(self, last_crawled: List[Tuple[str, datetime]]):
+        """複数の推しアカウントの最終クロール時刻を1回の UPDATE でまとめて更新"""
+        if not last_crawled:
+            return
+        # 同じユーザーが複数回含まれる場合は後の時刻を採用する
+        latest = dict(last_crawled)
+        cases = " ".join(["WHEN %s THEN %s"] * len(latest))
+        placeholders = ", ".join(["%s"] * len(latest))
+        query = f"""
+            UPDATE insta_account_list
+            SET last_crawled_at = CASE favorite_user_username {cases} END
+            WHERE favorite_user_username IN ({placeholders})
+        """
+        params: List = []
+        for username, last_crawled_at in latest.items():
+            params.extend((username, last_crawled_at))
+        params.extend(latest.keys())
+        self.db.execute_query(query, tuple(params))
+
     def update_favorite_user_is_alive(self, username: str, is_alive: bool):
         """推しアカウントの生存フラグを更新"""
         query = """
@@ -575,79 +594,111 @@ class InstaFavoriteUserRepository:
 class InstaVideoRepository:
     """Instagram専用のライト/ヘビー動画リポジトリ"""
 
+    INSERT_LIGHT_DATA_QUERY = """
+        INSERT INTO insta_light_raw_data (
+            video_url, video_id, user_username,
+            video_thumbnail_url,
+            play_count_text, play_count,
+            crawling_algorithm, crawled_at
+        ) VALUES (
+            %s, %s, %s, %s, %s, %s, %s, %s
+        ) ON DUPLICATE KEY UPDATE
+            video_url = VALUES(video_url),
+            video_id = VALUES(video_id),
+            user_username = VALUES(user_username),
+            video_thumbnail_url = VALUES(video_thumbnail_url),
+            play_count_text = VALUES(play_count_text),
+            play_count = VALUES(play_count),
+            crawling_algorithm = VALUES(crawling_algorithm),
+            crawled_at = VALUES(crawled_at)
+    """
+
+    INSERT_HEAVY_DATA_QUERY = """
+        INSERT INTO insta_heavy_raw_data (
+            video_url, video_id, video_title,
+            post_time_text, post_time,
+            comments_json, audio_title,
+            crawling_algorithm, crawled_at
+        ) VALUES (
+            %s, %s, %s, %s, %s, %s, %s, %s, %s
+        ) ON DUPLICATE KEY UPDATE
+            video_url = VALUES(video_url),
+            video_id = VALUES(video_id),
+            video_title = VALUES(video_title),
+            post_time_text = VALUES(post_time_text),
+            post_time = VALUES(post_time),
+            comments_json = VALUES(comments_json),
+            audio_title = VALUES(audio_title),
+            crawling_algorithm = VALUES(crawling_algorithm),
+            crawled_at = VALUES(crawled_at)
+    """
+
     def __init__(self, db: Database):
         self.db = db
 
+    @staticmethod
+    def _light_data_row(data: InstaLightRawData) -> tuple:
+        return (
+            data.video_url,
+            data.video_id,
+            data.user_username,
+            data.video_thumbnail_url,
+            data.play_count_text,
+            data.play_count,
+            data.crawling_algorithm,
+            data.crawled_at,
+        )
+
+    @staticmethod
+    def _heavy_data_row(data: InstaHeavyRawData) -> tuple:
+        return (
+            data.video_url,
+            data.video_id,
+            data.video_title,
+            data.post_time_text,
+            data.post_time,
+            data.comments_json,
+            data.audio_title,
+            data.crawling_algorithm,
+            data.crawled_at,
+        )
+
     def save_insta_light_data(self, data: InstaLightRawData):
-        query = """
-            INSERT INTO insta_light_raw_data (
-                video_url, video_id, user_username,
-                video_thumbnail_url,
-                play_count_text, play_count,
-                crawling_algorithm, crawled_at
-            ) VALUES (
-                %s, %s, %s, %s, %s, %s, %s, %s
-            ) ON DUPLICATE KEY UPDATE
-                video_url = VALUES(video_url),
-                video_id = VALUES(video_id),
-                user_username = VALUES(user_username),
-                video_thumbnail_url = VALUES(video_thumbnail_url),
-                play_count_text = VALUES(play_count_text),
-                play_count = VALUES(play_count),
-                crawling_algorithm = VALUES(crawling_algorithm),
-                crawled_at = VALUES(crawled_at)
+        self.db.execute_query(self.INSERT_LIGHT_DATA_QUERY, self._light_data_row(data))
+
+    def save_insta_light_data_bulk(self, datas: List[InstaLightRawData]):
+        """リール一覧から取得したライトデータをまとめて保存"""
+        if not datas:
+            return
+        self.save_insta_light_rows([self._light_data_row(data) for data in datas])
+
+    def save_insta_light_rows(self, rows: Sequence[tuple]):
         """
-        self.db.execute_query(
-            query,
-            (
-                data.video_url,
-                data.video_id,
-                data.user_username,
-                data.video_thumbnail_url,
-                data.play_count_text,
-                data.play_count,
-                data.crawling_algorithm,
-                data.crawled_at,
-            ),
-        )
+        INSERT の列順に並んだタプルをそのまま保存する（データクラスを経由しない）
+        rows は空でないタプルのリストを渡すこと
+        列順: video_url, video_id, user_username, video_thumbnail_url,
+              play_count_text, play_count, crawling_algorithm, crawled_at
+        """
+        cursor = self.db.execute_many(self.INSERT_LIGHT_DATA_QUERY, rows)
+        cursor.close()
 
     def save_insta_heavy_data(self, data: InstaHeavyRawData):
         """リール動画ページから取得した詳細データを保存"""
-        query = """
-            INSERT INTO insta_heavy_raw_data (
-                video_url, video_id, video_title,
-                post_time_text, post_time,
-                comments_json, audio_title,
-                crawling_algorithm, crawled_at
-            ) VALUES (
-                %s, %s, %s, %s, %s, %s, %s, %s, %s
-            ) ON DUPLICATE KEY UPDATE
-                video_url = VALUES(video_url),
-                video_id = VALUES(video_id),
-                video_title = VALUES(video_title),
-                post_time_text = VALUES(post_time_text),
-                post_time = VALUES(post_time),
-                comments_json = VALUES(comments_json),
-                audio_title = VALUES(audio_title),
-                crawling_algorithm = VALUES(crawling_algorithm),
-                crawled_at = VALUES(crawled_at)
-        """
-        self.db.execute_query(
-            query,
-            (
-                data.video_url,
-                data.video_id,
-                data.video_title,
-                data.post_time_text,
-                data.post_time,
-                data.comments_json,
-                data.audio_title,
-                data.crawling_algorithm,
-                data.crawled_at,
-            ),
+        self.db.execute_query(self.INSERT_HEAVY_DATA_QUERY, self._heavy_data_row(data))
+
+    def save_insta_heavy_data_bulk(self, datas: List[InstaHeavyRawData]):
+        """リール動画ページから取得した詳細データをまとめて保存"""
+        if not datas:
+            return
+        cursor = self.db.execute_many(
+            self.INSERT_HEAVY_DATA_QUERY, [self._heavy_data_row(data) for data in datas]
         )
+        cursor.close()
 
     def get_insta_video_ids_with_title(self, video_ids: List[str]) -> Set[str]:
+        """タイトル保存済みの video_id を1回の IN クエリでまとめて取得"""
+        # 重複した ID でプレースホルダーとバインド値を無駄に増やさない
+        video_ids = list(dict.fromkeys(video_ids))
         if not video_ids:
             return set()
         placeholders = ", ".join(["%s"] * len(video_ids))
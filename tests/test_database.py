@@ -0,0 +1,51 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+# リポジトリ直下をパスに追加（src パッケージとして読み込む）
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from src.database.database import Database
+except ImportError:  # mysql-connector / python-dotenv が無い環境ではスキップ
+    Database = None
+
+
+class _ListOnlyCursor:
+    """C拡張の CMySQLCursor と同じく、executemany にリスト・タプル以外を渡すとエラーにするカーソル"""
+
+    def __init__(self):
+        self.rows = None
+
+    def executemany(self, query, params_list):
+        if not isinstance(params_list, (list, tuple)):
+            raise TypeError("Parameters for query must be list or tuple.")
+        self.rows = params_list
+
+
+@unittest.skipIf(Database is None, "mysql-connector-python が必要です")
+class ExecuteManyTest(unittest.TestCase):
+    def setUp(self):
+        self.cursor = _ListOnlyCursor()
+        self.connection = mock.Mock()
+        self.connection.cursor.return_value = self.cursor
+        self.db = Database(config={})
+        self.db.get_connection = mock.Mock(return_value=self.connection)
+        self.db.connection = self.connection
+
+    def test_generator_rows_are_passed_as_list(self):
+        rows = ((i, f"video{i}") for i in range(3))
+        self.db.execute_many("INSERT INTO t VALUES (%s, %s)", rows)
+        self.assertEqual(self.cursor.rows, [(0, "video0"), (1, "video1"), (2, "video2")])
+        self.connection.commit.assert_called_once()
+        self.connection.rollback.assert_not_called()
+
+    def test_list_rows_are_passed_through(self):
+        rows = [(1, "a"), (2, "b")]
+        self.db.execute_many("INSERT INTO t VALUES (%s, %s)", rows)
+        self.assertIs(self.cursor.rows, rows)
+
+
+if __name__ == "__main__":
+    unittest.main()